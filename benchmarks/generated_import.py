@@ -0,0 +1,66 @@
+"""
+Import time of the module generated by `all`, with and without --fast-import.
+
+    python benchmarks/generated_import.py --types 8000 --kind pydantic
+
+Every import runs in a fresh interpreter, after importing the kind's package, so only
+the generated classes are measured. Field arguments are dropped from the synthetic
+schema, the fields of generated classes with arguments aren't valid python.
+"""
+import re
+import subprocess
+import sys
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import click
+
+from gqlcli.codegen import render_type, write_module
+from gqlcli.generator import TypeGenerator
+from gqlcli.make_schema import make_schema
+from gqlcli.synth import synth_schema
+
+# Stand-ins for the gql package, its decorators don't matter here.
+GQL_IMPORT = "from gql import enum_type, type_resolver\n"
+GQL_STUB = "def enum_type(cls):\n    return cls\n\n\ndef type_resolver(name):\n    return lambda func: func\n"
+
+PACKAGES = {"dataclass": "dataclasses", "msgspec": "msgspec", "pydantic": "pydantic"}
+
+TIMER = "import time, {package}; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def import_time(directory: Path, module: str, kind: str) -> float:
+    code = TIMER.format(package=PACKAGES.get(kind, "typing"), module=module)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True, check=True)
+    return float(proc.stdout)
+
+
+@click.command()
+@click.option("--types", default=2000, show_default=True, help="number of types of the synthetic schema")
+@click.option("--fields", default=10, show_default=True, help="fields per object type")
+@click.option("--kind", default="pydantic", show_default=True, help="kind of the generated classes")
+@click.option("--seed", default=0, show_default=True, help="random seed")
+@click.option("--repeat", default=5, show_default=True, help="best of N imports")
+def main(types: int, fields: int, kind: str, seed: int, repeat: int):
+    sdl = re.sub(r"\(arg\d[^)]*\)", "", synth_schema(types, fields, seed))
+    type_map = make_schema(sdl, assume_valid=True).type_map
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for module, fast_import in [("generated", False), ("generated_fast", True)]:
+            # Like `all --fast-import`.
+            render = partial(render_type, TypeGenerator(kind, deferred=fast_import))
+            with (directory / f"{module}.py").open("w") as out:
+                write_module(out, type_map, kind, render, fast_import=fast_import)
+            path = directory / f"{module}.py"
+            path.write_text(path.read_text().replace(GQL_IMPORT, GQL_STUB))
+
+            # The first import compiles the module.
+            import_time(directory, module, kind)
+            best = min(import_time(directory, module, kind) for _ in range(repeat))
+            print(f"{module:<16} {best:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Import time of the gqlcli entry point and its slowest modules.
+
+    python benchmarks/importtime.py --top 10
+
+The cumulative `python -X importtime` figures are taken, best of N runs. The budget and
+the deferred heavy dependencies are checked by tests/test_importtime.py.
+"""
+import re
+import subprocess
+import sys
+
+import click
+
+_r_importtime = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)$")
+
+
+def import_times() -> dict:
+    """Cumulative import time in microseconds of every module imported by gqlcli.main."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import gqlcli.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = _r_importtime.match(line)
+        if m:
+            times[m.group(3)] = int(m.group(2))
+    return times
+
+
+@click.command()
+@click.option("--top", default=10, show_default=True, help="slowest modules shown")
+@click.option("--repeat", default=5, show_default=True, help="best of N runs")
+def main(top: int, repeat: int):
+    runs = [import_times() for _ in range(repeat)]
+    best = {module: min(times.get(module, 0) for times in runs) for module in runs[0]}
+    print(f"import gqlcli.main: {best.pop('gqlcli.main') / 1000:.1f}ms")
+    for module, us in sorted(best.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {module:<40} {us / 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Construction time and memory per instance of the classes generated by every --kind.
+
+    python benchmarks/kinds.py --fields 10 --instances 100000
+
+Kinds whose package (pydantic, msgspec) isn't installed are skipped.
+"""
+import timeit
+import tracemalloc
+
+import click
+from graphql import build_schema
+
+from gqlcli.codegen import module_imports, render_type
+from gqlcli.generator import KINDS, TypeGenerator
+from gqlcli.utils import to_snake_case
+
+SCALARS = ["String", "Int", "Float", "Boolean"]
+VALUES = {"String": "value", "Int": 1, "Float": 1.0, "Boolean": True}
+
+
+def make_class(kind: str, sdl: str):
+    type_ = build_schema(sdl).get_type("Item")
+    code = module_imports(kind, enums=False).replace("from gql import enum_type, type_resolver\n", "")
+    code += render_type(TypeGenerator(kind), type_)
+    namespace = {}
+    exec(code, namespace)
+    return namespace["Item"]
+
+
+def constructor(kind: str, cls):
+    if kind != "none":
+        return cls
+
+    def construct(**kwargs):
+        # Plain classes have no __init__ taking the fields.
+        obj = cls()
+        obj.__dict__.update(kwargs)
+        return obj
+
+    return construct
+
+
+def instance_size(construct, kwargs: dict, instances: int) -> float:
+    """Average bytes allocated per instance, field values are shared."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [construct(**kwargs) for _ in range(instances)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Minus the list holding them.
+    return (after - before) / len(items) - 8
+
+
+@click.command()
+@click.option("--fields", default=10, show_default=True, help="scalar fields of the generated class")
+@click.option("--instances", default=100000, show_default=True, help="instances created per measure")
+@click.option("--repeat", default=5, show_default=True, help="best of N runs")
+def main(fields: int, instances: int, repeat: int):
+    types = [SCALARS[i % len(SCALARS)] for i in range(fields)]
+    sdl = "type Query { item: Item }\ntype Item {\n" + "".join(f"  field{i}: {t}!\n" for i, t in enumerate(types)) + "}"
+    kwargs = {to_snake_case(f"field{i}"): VALUES[t] for i, t in enumerate(types)}
+
+    print(f"{'kind':<16} {'construct':>12} {'bytes':>8}")
+    for kind in KINDS:
+        try:
+            construct = constructor(kind, make_class(kind, sdl))
+        except (ImportError, TypeError) as e:
+            # Missing package, or dataclass slots before python 3.10.
+            print(f"{kind:<16} skipped: {e}")
+            continue
+        best = min(timeit.repeat(lambda: construct(**kwargs), number=instances, repeat=repeat)) / instances
+        size = instance_size(construct, kwargs, instances)
+        print(f"{kind:<16} {best * 1e9:>10.0f}ns {size:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
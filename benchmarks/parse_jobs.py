@@ -0,0 +1,78 @@
+"""
+Compare serial and parallel parsing of a schema directory.
+
+    python benchmarks/parse_jobs.py --files 3000 --jobs 8
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from gqlcli.make_schema import make_schema_from_path, parse_files
+
+TYPE_TEMPLATE = """
+\"\"\"Type number {i}.\"\"\"
+type Type{i} {{
+  id: ID!
+  name: String
+  count: Int
+  ratio: Float
+  tags: [String!]!
+  parent: Type{parent}
+  children(first: Int, after: String): [Type{child}!]
+}}
+
+extend type Query {{
+  type{i}(id: ID!): Type{i}
+}}
+"""
+
+
+def write_schema(directory: Path, files: int, types_per_file: int):
+    total = files * types_per_file
+    for n in range(files):
+        body = "".join(
+            TYPE_TEMPLATE.format(i=i, parent=(i + 1) % total, child=(i + 7) % total)
+            for i in range(n * types_per_file, (n + 1) * types_per_file)
+        )
+        sub = directory / f"service{n % 20}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"types{n}.graphql").write_text(body)
+
+
+def timeit(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()
+@click.option("--files", default=3000, help="number of sdl files")
+@click.option("--types-per-file", default=5, help="types defined in every file")
+@click.option("--jobs", default=os.cpu_count(), help="processes for the parallel run")
+@click.option("--repeat", default=3, help="best of N runs")
+def main(files: int, types_per_file: int, jobs: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_schema(directory, files, types_per_file)
+
+        paths = sorted(directory.glob("**/*.graphql"))
+
+        print(f"files: {files}, types: {files * types_per_file}")
+        for name, func in [
+            ("parse", lambda j: parse_files(paths, jobs=j)),
+            ("load", lambda j: make_schema_from_path(directory, assume_valid=True, jobs=j)),
+        ]:
+            serial = timeit(lambda: func(1), repeat)
+            parallel = timeit(lambda: func(jobs), repeat)
+            print(f"{name} jobs=1: {serial:.3f}s")
+            print(f"{name} jobs={jobs}: {parallel:.3f}s ({serial / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Benchmark suite on a synthetic schema, results are written as JSON to compare commits.
+
+    python benchmarks/run.py --types 1000 --output before.json
+    python benchmarks/run.py --types 1000 --output after.json --compare before.json
+
+Every benchmark reports the best and mean wall time of `--repeat` runs.
+"""
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import click
+import graphql
+from graphql import GraphQLSchema, parse
+
+from gqlcli.codegen import render_type
+from gqlcli.cost import CostEstimator
+from gqlcli.fake import fake_variable
+from gqlcli.generator import TypeGenerator
+from gqlcli.make_schema import make_schema_from_path
+from gqlcli.playground import PlaygroundServer
+from gqlcli.print import FragmentQueryPrinter, print_query
+from gqlcli.reachable import TypeGraph
+from gqlcli.schema_visitor import SchemaDirectiveVisitor
+from gqlcli.synth import write_synth_schema
+
+
+class UpperDirective(SchemaDirectiveVisitor):
+    def visit_field_definition(self, field, object_type):
+        resolve = field.resolve
+
+        def resolve_upper(obj, info, **kwargs):
+            value = resolve(obj, info, **kwargs) if resolve else None
+            return value.upper() if isinstance(value, str) else value
+
+        field.resolve = resolve_upper
+        return field
+
+
+def bench(func: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict[str, float]:
+    """Time `func(setup())`, the setup isn't measured."""
+    times = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "mean": statistics.mean(times), "runs": repeat}
+
+
+def root_fields(schema: GraphQLSchema):
+    for root in (schema.query_type, schema.mutation_type):
+        if root:
+            yield from root.fields.items()
+
+
+def render_all(schema: GraphQLSchema, kind: str):
+    generator = TypeGenerator(kind)
+    for name, type_ in schema.type_map.items():
+        if not name.startswith("__"):
+            render_type(generator, type_)
+
+
+def prune_queries(type_graph: TypeGraph, count: int):
+    """Types reachable from each of the first `count` query fields."""
+    for name in list(type_graph.schema.query_type.fields)[:count]:
+        type_graph.prune(type_graph.root_types([f"Query.{name}"]))
+
+
+def print_fragment_queries(schema: GraphQLSchema, roots: list) -> list:
+    # A printer shares its fragments, every run starts with a fresh one.
+    printer = FragmentQueryPrinter(schema, max_depth=4)
+    return [printer.print_query(name) for name, _ in roots]
+
+
+def estimate_costs(schema: GraphQLSchema, documents: list):
+    # One estimator for all documents, as `cost` does.
+    estimator = CostEstimator(schema)
+    return [estimator.estimate(document) for document in documents]
+
+
+def playground_requests(schema: GraphQLSchema, count: int) -> list:
+    """WSGI environs posting a client query of every (sampled) object query field."""
+    environs = []
+    fields = [(name, field) for name, field in schema.query_type.fields.items() if not field.args.get("first")]
+    for name, field in fields[:count]:
+        body = json.dumps({"query": print_query(schema, name), "variables": json.loads(fake_variable(field))}).encode()
+        environs.append(
+            {
+                "REQUEST_METHOD": "POST",
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "wsgi.input": body,
+            }
+        )
+    return environs
+
+
+def serve(server: PlaygroundServer, environs: list):
+    def start_response(status, headers):
+        pass
+
+    for environ in environs:
+        server({**environ, "wsgi.input": io.BytesIO(environ["wsgi.input"])}, start_response)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+
+def compare(results: dict, old: dict):
+    print(f"\ncompared to {old.get('commit') or 'unknown commit'}:")
+    for name, result in results.items():
+        before = old.get("results", {}).get(name)
+        if before:
+            ratio = before["best"] / result["best"]
+            print(f"{name:<24} {before['best']:.4f}s -> {result['best']:.4f}s ({ratio:.2f}x)")
+
+
+@click.command()
+@click.option("--types", default=500, show_default=True, help="number of types of the synthetic schema")
+@click.option("--fields", default=10, show_default=True, help="fields per object type")
+@click.option("--files", default=20, show_default=True, help="sdl files the schema is split into")
+@click.option("--seed", default=0, show_default=True, help="random seed")
+@click.option("--repeat", default=5, show_default=True, help="runs of every benchmark")
+@click.option("--requests", default=100, show_default=True, help="playground requests per run")
+@click.option("--output", default="benchmarks.json", show_default=True, help="JSON results file")
+@click.option("--compare", "compare_to", type=click.File(), help="previous JSON results to compare with")
+def main(
+    types: int,
+    fields: int,
+    files: int,
+    seed: int,
+    repeat: int,
+    requests: int,
+    output: str,
+    compare_to,
+):
+    results = {}
+
+    def record(name: str, result: Dict[str, float]):
+        results[name] = result
+        print(f"{name:<24} best {result['best']:.4f}s mean {result['mean']:.4f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, federation_path = Path(tmp) / "schema", Path(tmp) / "federation"
+        write_synth_schema(path, types, fields, files, seed)
+        write_synth_schema(federation_path, types, fields, files, seed, federation=True)
+
+        record("load", bench(lambda: make_schema_from_path(path), repeat))
+        record("load_federation", bench(lambda: make_schema_from_path(federation_path, federation=True), repeat))
+
+        def load() -> GraphQLSchema:
+            return make_schema_from_path(path)
+
+        schema = load()
+
+        for kind in ("none", "dataclass", "pydantic"):
+            record(f"types_{kind}", bench(lambda: render_all(schema, kind), repeat))
+
+        roots = list(root_fields(schema))
+        record("type_graph", bench(lambda: TypeGraph(schema), repeat))
+        type_graph = TypeGraph(schema)
+        record("reachable", bench(lambda: prune_queries(type_graph, requests), repeat))
+        record("print_query", bench(lambda: [print_query(schema, name) for name, _ in roots], repeat))
+        record("print_query_fragments", bench(lambda: print_fragment_queries(schema, roots), repeat))
+        documents = [parse(query) for query in print_fragment_queries(schema, roots)]
+        record("cost", bench(lambda: estimate_costs(schema, documents), repeat))
+
+        # fake_input_type picks random values.
+        random.seed(seed)
+        record("fake_variable", bench(lambda: [fake_variable(field) for _, field in roots], repeat))
+
+        # Visiting rewrites the schema, every run gets a fresh one.
+        directives = {"upper": UpperDirective}
+        record(
+            "schema_directives",
+            bench(lambda s: SchemaDirectiveVisitor.visit_schema_directives(s, directives), repeat, load),
+        )
+
+        environs = playground_requests(schema, requests)
+        server = PlaygroundServer(schema)
+        record("playground", bench(lambda: serve(server, environs), repeat))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "graphql-core": graphql.__version__,
+        "params": {"types": types, "fields": fields, "files": files, "seed": seed, "requests": len(environs)},
+        "schema": {
+            "types": len(schema.type_map),
+            "root_fields": len(roots),
+            "fields": sum(len(getattr(t, "fields", {})) for t in schema.type_map.values()),
+        },
+        "results": results,
+    }
+    Path(output).write_text(json.dumps(report, indent=2))
+    print(f"\nresults written to {output}")
+
+    if compare_to:
+        compare(results, json.load(compare_to))
+
+
+if __name__ == "__main__":
+    main()
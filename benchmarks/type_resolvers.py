@@ -0,0 +1,60 @@
+"""
+Resolution time of the generated type resolvers, isinstance chain against dispatch table.
+
+    python benchmarks/type_resolvers.py --implementations 60
+
+Objects are instances of every implementation in turn, plus subclasses of them which
+the dispatch table resolves through its (cached) MRO fallback.
+"""
+import timeit
+
+import click
+from graphql import build_schema
+
+from gqlcli.generator import TypeResolverGenerator
+
+
+def make_resolver(sdl: str, dispatch: bool, classes: dict):
+    generator = TypeResolverGenerator(build_schema(sdl).type_map, dispatch)
+    namespace = {**classes, "type_resolver": lambda name: lambda func: func}
+    exec("".join(generator.all_type_resolvers()), namespace)
+    return namespace["resolve_node_type"]
+
+
+def resolve_all(resolve, objects: list):
+    for obj in objects:
+        resolve(obj, None, None)
+
+
+@click.command()
+@click.option("--implementations", default=60, show_default=True, help="object types implementing the interface")
+@click.option("--objects", default=10000, show_default=True, help="objects resolved per measure")
+@click.option("--repeat", default=5, show_default=True, help="best of N runs")
+def main(implementations: int, objects: int, repeat: int):
+    names = [f"Object{i}" for i in range(implementations)]
+    sdl = "type Query { node: Node }\ninterface Node { id: ID }\n" + "".join(
+        f"type {name} implements Node {{ id: ID }}\n" for name in names
+    )
+    classes = {name: type(name, (), {}) for name in names}
+    subclasses = [type(f"Sub{name}", (cls,), {}) for name, cls in classes.items()]
+
+    instances = [cls() for cls in classes.values()]
+    cases = {
+        "first": [instances[0]] * objects,
+        "last": [instances[-1]] * objects,
+        "mixed": [instances[i % len(instances)] for i in range(objects)],
+        "subclasses": [subclasses[i % len(subclasses)]() for i in range(objects)],
+    }
+
+    print(f"{'objects':<12} {'isinstance':>12} {'dispatch':>12} {'speedup':>8}")
+    resolvers = {dispatch: make_resolver(sdl, dispatch, classes) for dispatch in (False, True)}
+    for case, items in cases.items():
+        times = [
+            min(timeit.repeat(lambda: resolve_all(resolvers[dispatch], items), number=1, repeat=repeat)) / objects
+            for dispatch in (False, True)
+        ]
+        print(f"{case:<12} {times[0] * 1e9:>10.0f}ns {times[1] * 1e9:>10.0f}ns {times[0] / times[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
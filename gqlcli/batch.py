@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .cache import SchemaCache
+from .daemon import Daemon
+
+Result = Tuple[str, str, int]
+
+
+class BatchJob(NamedTuple):
+    """A gqlcli call of a batch config, on the schema of `host` or the resolved `path`."""
+
+    host: Optional[str]
+    path: Optional[Path]
+    argv: List[str]
+    output: Optional[Path]
+
+    @property
+    def key(self) -> str:
+        return self.host or str(self.path)
+
+
+def option_args(options: Dict[str, Any]) -> List[str]:
+    """Command line of an options table, `{kind = "dataclass", frozen = true}` is `--kind dataclass --frozen`."""
+    args = []
+    for name, value in options.items():
+        option = f"--{name.replace('_', '-')}"
+        if value is True:
+            args.append(option)
+        elif value is False:
+            continue
+        else:
+            for v in value if isinstance(value, list) else [value]:
+                args.extend([option, str(v)])
+    return args
+
+
+def load_config(file: Path, global_args: List[str]) -> Tuple[List[BatchJob], Optional[int]]:
+    """
+    Jobs and worker count of the TOML batch config `file`.
+
+    Every `[[job]]` has a `path` or `host`, a `command`, an `options` table, `args` and
+    an `output` file for what the command prints. Relative paths, options included, are
+    relative to the directory of `file`.
+    Raise ValueError for invalid jobs.
+    """
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+
+    with file.open("rb") as f:
+        config = tomllib.load(f)
+    root = file.resolve().parent
+
+    jobs = []
+    for i, job in enumerate(config.get("job", []), 1):
+        host, path, command = job.get("host"), job.get("path"), job.get("command")
+        if not command:
+            raise ValueError(f"job {i} has no command")
+        if bool(host) == bool(path):
+            raise ValueError(f"job {i} needs either a path or a host")
+        if path:
+            path = (root / path).resolve()
+            if not path.exists():
+                raise ValueError(f"job {i}: {path} doesn't exist")
+        argv = [*global_args, *(["-h", host] if host else ["-p", str(path)]), command]
+        argv.extend(option_args(job.get("options", {})))
+        argv.extend(str(arg) for arg in job.get("args", []))
+        if command == "c":
+            # Batches run headless, and outputs go to files.
+            argv.append("--no-copy")
+        output = root / job["output"] if job.get("output") else None
+        jobs.append(BatchJob(host, path, argv, output))
+    return jobs, config.get("workers")
+
+
+def shared_files(jobs: List[BatchJob]) -> List[Path]:
+    """Sdl files included by the schemas of several jobs."""
+    from .make_schema import schema_files
+
+    counts: Counter = Counter()
+    # Sources are named after the first path a file is found at, as when parsed by the jobs.
+    first: Dict[Path, Path] = {}
+    for path in dict.fromkeys(job.path for job in jobs if job.path):
+        for file in schema_files(path):
+            first.setdefault(file.resolve(), file)
+            counts[file.resolve()] += 1
+    return [first[file] for file, count in counts.items() if count > 1]
+
+
+def run_jobs(jobs: List[BatchJob], settings: Dict[str, Any], shared: List[Path], cwd: str) -> List[Result]:
+    """Run `jobs` of one schema in this process, the schema is loaded once."""
+    from .lazy import schema_loader
+    from .make_schema import share_documents
+
+    share_documents(shared)
+    cache = None if settings["no_cache"] else SchemaCache(settings["cache_dir"])
+    job = jobs[0]
+    make_schema = schema_loader(job.host, job.path, cache, settings["ttl"], settings["refresh"], 1, settings["debug"])
+    daemon = Daemon(job.key, make_schema, job.path)
+    return [daemon.run(job.argv, cwd) for job in jobs]
+
+
+def run_batch(
+    jobs: List[BatchJob], settings: Dict[str, Any], cwd: str, workers: Optional[int] = None
+) -> List[Result]:
+    """
+    Run `jobs` in the directory `cwd`, results are in the order of `jobs`.
+
+    Jobs on the same schema run one after the other in a worker sharing the loaded schema,
+    schemas are spread over `workers` processes. Files included by several schemas are
+    parsed once, before forking the workers.
+    """
+    from .make_schema import parse_from_file, share_documents
+
+    groups: Dict[str, List[int]] = {}
+    for i, job in enumerate(jobs):
+        groups.setdefault(job.key, []).append(i)
+
+    shared = shared_files(jobs)
+    share_documents(shared)
+    workers = min(workers or os.cpu_count() or 1, len(groups))
+    results: List[Optional[Result]] = [None] * len(jobs)
+    if workers <= 1:
+        current = os.getcwd()
+        try:
+            for indexes in groups.values():
+                for i, result in zip(indexes, run_jobs([jobs[i] for i in indexes], settings, shared, cwd)):
+                    results[i] = result
+        finally:
+            os.chdir(current)
+        return results
+
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        for file in shared:
+            parse_from_file(file)
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(run_jobs, [jobs[i] for i in indexes], settings, shared, cwd): indexes
+            for indexes in groups.values()
+        }
+        for future, indexes in futures.items():
+            for i, result in zip(indexes, future.result()):
+                results[i] = result
+    return results
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import __version__
+
+DEFAULT_CACHE_DIR = ".gqlcli_cache"
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# Seconds a cached host introspection is used before revalidating it.
+DEFAULT_TTL = 300
+
+FILES_MANIFEST = "files.json"
+
+
+def file_digest(file: Path) -> str:
+    h = hashlib.sha256()
+    with file.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SchemaCache:
+    """
+    On-disk cache for compiled schemas.
+
+    Entries are pickled into `directory` and keyed by the path, mtime and content hash
+    of every source file, so an unchanged schema directory loads without lexing,
+    parsing or building. Least recently used entries are evicted once the directory
+    grows over `max_size` bytes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._files: Optional[Dict[str, List]] = None
+        self._files_dirty = False
+
+    @property
+    def files(self) -> Dict[str, List]:
+        if self._files is None:
+            try:
+                self._files = json.loads((self.directory / FILES_MANIFEST).read_text())
+            except (OSError, ValueError):
+                self._files = {}
+        return self._files
+
+    def file_hash(self, file: Path) -> str:
+        """Content hash of `file`, only re-read when its mtime or size changed."""
+        stat = file.stat()
+        name = str(file.resolve())
+        entry = self.files.get(name)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        digest = file_digest(file)
+        self.files[name] = [stat.st_mtime_ns, stat.st_size, digest]
+        self._files_dirty = True
+        return digest
+
+    def key(self, files: Iterable[Path], *options: Any) -> str:
+        h = hashlib.sha256(f"{__version__}:{options!r}".encode())
+        for file in sorted(files):
+            h.update(f"\0{file}\0{self.file_hash(file)}".encode())
+        return h.hexdigest()
+
+    def _entry(self, namespace: str, key: str) -> Path:
+        return self.directory / f"{namespace}-{key}.pickle"
+
+    def get(self, namespace: str, key: str) -> Any:
+        entry = self._entry(namespace, key)
+        try:
+            with entry.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupted or written by an incompatible version, drop it.
+            entry.unlink(missing_ok=True)
+            return None
+
+        # Touch the entry so eviction keeps recently used ones.
+        os.utime(entry)
+        return value
+
+    def set(self, namespace: str, key: str, value: Any) -> bool:
+        """Store `value`, return False when it can't be pickled."""
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            # e.g. schemas carrying resolver closures, or with type reference chains
+            # longer than the recursion limit.
+            return False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(namespace, key)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, entry)
+        self.evict()
+        return True
+
+    def save(self):
+        if not self._files_dirty:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = self.directory / FILES_MANIFEST
+        tmp = manifest.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.files))
+        os.replace(tmp, manifest)
+        self._files_dirty = False
+
+    def evict(self):
+        entries: List[Tuple[float, int, Path]] = []
+        total = 0
+        for entry in self.directory.glob("*.pickle"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        entries.sort()
+        while total > self.max_size and entries:
+            _, size, entry = entries.pop(0)
+            entry.unlink(missing_ok=True)
+            total -= size
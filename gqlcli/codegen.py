@@ -0,0 +1,225 @@
+import os
+import re
+from functools import partial
+from typing import IO, Callable, Dict, Iterable, List, Optional, Tuple, cast
+
+from graphql import (
+    GraphQLEnumType,
+    GraphQLInputObjectType,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    get_named_type,
+    is_enum_type,
+    is_input_object_type,
+    is_interface_type,
+    is_object_type,
+)
+
+from .generator import TypeGenerator, TypeMap, TypeResolverGenerator
+from .pool import map_schema_chunks
+
+Render = Callable[[GraphQLNamedType], str]
+
+
+def render_type(generator: TypeGenerator, type_: GraphQLNamedType, enum: str = "str") -> str:
+    if is_enum_type(type_):
+        if enum == "str":
+            return generator.str_enum_type(cast(GraphQLEnumType, type_))
+        elif enum == "number":
+            return generator.number_enum_type(cast(GraphQLEnumType, type_))
+    elif is_object_type(type_):
+        return generator.object_type(cast(GraphQLObjectType, type_))
+    elif is_interface_type(type_):
+        return generator.interface_type(cast(GraphQLInterfaceType, type_))
+    elif is_input_object_type(type_):
+        return generator.input_type(cast(GraphQLInputObjectType, type_))
+    return ""
+
+
+def module_types(types: Iterable[GraphQLNamedType]) -> Tuple[List[GraphQLNamedType], ...]:
+    """Generated types grouped the way they are written: enums, interfaces, objects and inputs."""
+    enum_types, interface_types, object_types, input_types = [], [], [], []
+    for type_ in types:
+        if type_.name in ["Query", "Mutation"] or type_.name.startswith("__"):
+            continue
+        elif is_enum_type(type_):
+            enum_types.append(type_)
+        elif is_object_type(type_):
+            object_types.append(type_)
+        elif is_interface_type(type_):
+            interface_types.append(type_)
+        elif is_input_object_type(type_):
+            input_types.append(type_)
+    return enum_types, interface_types, object_types, input_types
+
+
+def module_imports(kind: str, enums: bool) -> str:
+    imports = ""
+    if kind in ["dataclass", "dataclass-slots"]:
+        imports += "from dataclasses import dataclass\n"
+    if enums:
+        imports += "from enum import Enum\n"
+    if kind == "namedtuple":
+        imports += "from typing import Any, Dict, List, NamedTuple, NewType, Optional, Union\n\n"
+    else:
+        imports += "from typing import Any, Dict, List, NewType, Optional, Union\n\n"
+    imports += "from gql import enum_type, type_resolver\n"
+    if kind == "msgspec":
+        imports += "from msgspec import Struct\n"
+    if kind == "pydantic":
+        imports += "from pydantic import BaseModel\n"
+    imports += "\n"
+    return imports
+
+
+def write_joined(out: IO[str], chunks: Iterable[str], separator: str = "\n"):
+    for i, chunk in enumerate(chunks):
+        if i:
+            out.write(separator)
+        out.write(chunk)
+
+
+def write_module(
+    out: IO[str],
+    type_map: TypeMap,
+    kind: str,
+    render: Optional[Render] = None,
+    type_resolvers: Optional[TypeResolverGenerator] = None,
+    fast_import: bool = False,
+):
+    """
+    Write the module with all schema types and type resolvers to `out`, one type at a time.
+
+    `render` and `type_resolvers` override how types and type resolvers are rendered. With
+    `fast_import` classes are ordered, see `write_ordered`, and annotations are deferred.
+    """
+    if render is None:
+        render = partial(render_type, TypeGenerator(kind))
+
+    enum_types, interface_types, object_types, input_types = module_types(type_map.values())
+    if fast_import and kind != "pydantic":
+        # Pydantic evaluates string annotations, which costs more than it saves, its models defer building instead.
+        out.write("from __future__ import annotations\n\n")
+    out.write(module_imports(kind, bool(enum_types)))
+    if fast_import:
+        write_ordered(out, [*enum_types, *interface_types, *object_types, *input_types], render)
+    else:
+        for types, end in [(enum_types, "\n"), (interface_types, "\n"), (object_types, "\n"), (input_types, "")]:
+            if types:
+                write_joined(out, map(render, types))
+                out.write(end)
+    write_joined(out, (type_resolvers or TypeResolverGenerator(type_map)).all_type_resolvers())
+
+
+def type_dependencies(type_: GraphQLNamedType) -> List[str]:
+    """Names of the types the class of `type_` refers to: interfaces, field and argument types."""
+    names = dict.fromkeys(i.name for i in getattr(type_, "interfaces", ()))
+    for field in getattr(type_, "fields", {}).values():
+        names[get_named_type(field.type).name] = None
+        names.update((get_named_type(arg.type).name, None) for arg in getattr(field, "args", {}).values())
+    names.pop(type_.name, None)
+    return list(names)
+
+
+def topological_types(types: List[GraphQLNamedType]) -> List[GraphQLNamedType]:
+    """
+    `types` ordered so that every type comes after the types it refers to.
+
+    Types referring to each other in a cycle keep their order in `types`, so base interfaces
+    stay first. Cycles are the strongly connected components, found with Tarjan's algorithm.
+    """
+    index = {type_.name: i for i, type_ in enumerate(types)}
+    edges = [[index[name] for name in type_dependencies(type_) if name in index] for type_ in types]
+
+    order: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    stack: List[int] = []
+    on_stack = set()
+    ordered: List[GraphQLNamedType] = []
+    for root in range(len(types)):
+        if root in order:
+            continue
+        # Iterative depth first search, a frame is a vertex and the next edge to follow.
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                order[v] = low[v] = len(order)
+                stack.append(v)
+                on_stack.add(v)
+            else:
+                low[v] = min(low[v], low[edges[v][i - 1]])
+            for j in range(i, len(edges[v])):
+                w = edges[v][j]
+                if w not in order:
+                    work.extend([(v, j + 1), (w, 0)])
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], order[w])
+            else:
+                if low[v] == order[v]:
+                    component = []
+                    while not component or component[-1] != v:
+                        component.append(stack.pop())
+                        on_stack.discard(component[-1])
+                    ordered.extend(types[w] for w in sorted(component))
+    return ordered
+
+
+QUOTED_NAME = re.compile(r"'([_A-Za-z][_0-9A-Za-z]*)'")
+
+
+def write_ordered(out: IO[str], types: List[GraphQLNamedType], render: Render):
+    """
+    Write `types` in topological order, classes refer to the classes defined before them by name.
+
+    Only references to classes defined later, in cycles, stay quoted.
+    """
+    defined = set()
+
+    def unquote(match: "re.Match") -> str:
+        return match.group(1) if match.group(1) in defined else match.group(0)
+
+    def chunks() -> Iterable[str]:
+        for type_ in topological_types(types):
+            text = render(type_)
+            if not is_enum_type(type_):
+                text = QUOTED_NAME.sub(unquote, text)
+            defined.add(type_.name)
+            yield text
+
+    write_joined(out, chunks())
+    if types:
+        out.write("\n")
+
+
+def _type_renderer(schema: GraphQLSchema, generator: TypeGenerator) -> Tuple[GraphQLSchema, Render]:
+    return schema, partial(render_type, generator)
+
+
+def _render_names(worker: Tuple[GraphQLSchema, Render], names: List[str]) -> List[str]:
+    schema, render = worker
+    return [render(schema.type_map[name]) for name in names]
+
+
+def render_types(
+    schema: GraphQLSchema, generator: TypeGenerator, jobs: int = 1, names: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """
+    Render every generated type of `schema`, or just `names`, in a pool of `jobs` processes.
+
+    Chunks come back in order, so the result doesn't depend on `jobs`.
+    """
+    if names is None:
+        names = [type_.name for types in module_types(schema.type_map.values()) for type_ in types]
+    # More processes than cores only add schema rebuilds.
+    jobs = min(jobs, os.cpu_count() or 1)
+    if jobs <= 1 or len(names) <= 1:
+        render = partial(render_type, generator)
+        return {name: render(schema.type_map[name]) for name in names}
+
+    size = max(1, len(names) // (jobs * 4))
+    rendered = map_schema_chunks(schema, names, jobs, size, _type_renderer, (generator,), _render_names)
+    return dict(zip(names, rendered))
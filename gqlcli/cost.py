@@ -0,0 +1,239 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    is_list_type,
+    is_object_type,
+    is_wrapping_type,
+    print_ast,
+    value_from_ast_untyped,
+)
+
+DEFAULT_LIST_SIZE = 10
+
+
+class Cost(NamedTuple):
+    """Depth, field count and estimated result size of a selection."""
+
+    depth: int
+    fields: int
+    size: float
+
+
+class FieldCost(NamedTuple):
+    """Static cost of a field: its named type, weight, nested lists and @listSize arguments."""
+
+    type_name: str
+    weight: float
+    lists: int
+    assumed_size: Optional[int]
+    slicing_arguments: Tuple[str, ...]
+
+
+def directive_args(node, name: str) -> Optional[Dict[str, Any]]:
+    """Arguments of the directive `name` applied on a schema `node`, None if it isn't."""
+    for directive in getattr(node, "directives", None) or []:
+        if directive.name.value == name:
+            return {arg.name.value: value_from_ast_untyped(arg.value) for arg in directive.arguments}
+    return None
+
+
+def type_weight(type_) -> Optional[float]:
+    for node in [getattr(type_, "ast_node", None), *(getattr(type_, "extension_ast_nodes", None) or [])]:
+        args = directive_args(node, "cost")
+        if args and "weight" in args:
+            return float(args["weight"])
+    return None
+
+
+def node_text(node) -> str:
+    """Source text of a parsed `node`."""
+    if node.loc:
+        return node.loc.source.body[node.loc.start : node.loc.end]
+    return print_ast(node)
+
+
+class CostEstimator:
+    """
+    Static cost of operations: depth, field count and estimated result size.
+
+    Every field counts its `@cost(weight:)`, or its type's, or 1, times the size of its lists:
+    the value of a `@listSize(slicingArguments:)` argument, its `assumedSize` or `list_size`.
+    Among the fragments on the possible types of an interface or union, only the largest
+    counts. The costs of the fields of every type and of fragments are memoized, across
+    documents too, so scoring many operations sharing fragments is fast.
+    """
+
+    def __init__(self, schema: GraphQLSchema, list_size: int = DEFAULT_LIST_SIZE, variables: Dict[str, Any] = None):
+        self.schema = schema
+        self.list_size = list_size
+        self.variables = variables or {}
+        self.field_costs: Dict[str, Dict[str, FieldCost]] = {}
+        # Costs of fragment texts, with the variables they depend on.
+        self.fragment_costs: Dict[str, List[Tuple[Dict[str, Any], Cost]]] = {}
+
+    def type_fields(self, type_name: str) -> Dict[str, FieldCost]:
+        if type_name not in self.field_costs:
+            type_ = self.schema.get_type(type_name)
+            if type_ is None:
+                raise ValueError(f"Unknown type {type_name}")
+            costs = {}
+            for name, field in getattr(type_, "fields", {}).items():
+                named = get_named_type(field.type)
+                field_cost = directive_args(field.ast_node, "cost") or {}
+                weight = field_cost.get("weight")
+                if weight is None:
+                    weight = type_weight(named)
+                list_size = directive_args(field.ast_node, "listSize") or {}
+                lists, t = 0, field.type
+                while is_wrapping_type(t):
+                    lists += is_list_type(t)
+                    t = t.of_type
+                costs[name] = FieldCost(
+                    named.name,
+                    1.0 if weight is None else float(weight),
+                    lists,
+                    list_size.get("assumedSize"),
+                    tuple(list_size.get("slicingArguments") or ()),
+                )
+            self.field_costs[type_name] = costs
+        return self.field_costs[type_name]
+
+    def estimate(self, document: DocumentNode) -> Dict[str, Cost]:
+        """Cost of every operation of `document` by name, anonymous ones are named by position."""
+        fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+        walk = _Walk(self, fragments)
+        costs = {}
+        operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+        for i, operation in enumerate(operations, 1):
+            root = self.schema.get_root_type(operation.operation)
+            if root is None:
+                raise ValueError(f"The schema has no {operation.operation.value} type")
+            variables = {
+                v.variable.name.value: value_from_ast_untyped(v.default_value)
+                for v in operation.variable_definitions
+                if v.default_value
+            }
+            variables.update(self.variables)
+            walk.variables = variables
+            name = operation.name.value if operation.name else f"operation{i}"
+            costs[name] = walk.selection_set(root.name, operation.selection_set, set())
+        return costs
+
+
+class _Walk:
+    """The walk of one document, its fragments are named in it."""
+
+    def __init__(self, estimator: CostEstimator, fragments: Dict[str, FragmentDefinitionNode]):
+        self.estimator = estimator
+        self.fragments = fragments
+        self.variables: Dict[str, Any] = {}
+        self.keys: Dict[str, str] = {}
+        self.visiting: Set[str] = set()
+
+    def fragment_key(self, name: str) -> str:
+        """Text of the fragment `name` and of every fragment it spreads, which its cost depends on."""
+        if name not in self.keys:
+            texts, todo = {}, [name]
+            while todo:
+                current = todo.pop()
+                if current in texts:
+                    continue
+                if current not in self.fragments:
+                    raise ValueError(f"Unknown fragment {current}")
+                texts[current] = node_text(self.fragments[current])
+                stack = [self.fragments[current].selection_set]
+                while stack:
+                    for selection in stack.pop().selections:
+                        if isinstance(selection, FragmentSpreadNode):
+                            todo.append(selection.name.value)
+                        elif selection.selection_set:
+                            stack.append(selection.selection_set)
+            self.keys[name] = "\n".join([texts.pop(name), *sorted(texts.values())])
+        return self.keys[name]
+
+    def fragment(self, name: str, used: Set[str]) -> Cost:
+        key = self.fragment_key(name)
+        costs = self.estimator.fragment_costs.setdefault(key, [])
+        for bindings, cost in costs:
+            if all(self.variables.get(k) == v for k, v in bindings.items()):
+                used.update(bindings)
+                return cost
+        if name in self.visiting:
+            raise ValueError(f"Fragment {name} spreads itself")
+        self.visiting.add(name)
+        fragment_used: Set[str] = set()
+        fragment = self.fragments[name]
+        cost = self.selection_set(fragment.type_condition.name.value, fragment.selection_set, fragment_used)
+        self.visiting.discard(name)
+        costs.append(({k: self.variables.get(k) for k in fragment_used}, cost))
+        used.update(fragment_used)
+        return cost
+
+    def list_size(self, field_cost: FieldCost, node: FieldNode, used: Set[str]) -> int:
+        sizes = []
+        for arg in node.arguments:
+            if arg.name.value not in field_cost.slicing_arguments:
+                continue
+            value = arg.value
+            if isinstance(value, VariableNode):
+                used.add(value.name.value)
+                value = self.variables.get(value.name.value)
+            elif isinstance(value, IntValueNode):
+                value = int(value.value)
+            if isinstance(value, int):
+                sizes.append(value)
+        if sizes:
+            return max(sizes)
+        return self.estimator.list_size if field_cost.assumed_size is None else field_cost.assumed_size
+
+    def selection_set(self, type_name: str, selection_set: SelectionSetNode, used: Set[str]) -> Cost:
+        """
+        Cost of a selection set on `type_name`, `used` collects the variables it depends on.
+
+        Fragments on other object types than `type_name` are alternatives, the largest counts.
+        """
+        fields = self.estimator.type_fields(type_name)
+        depth, count, size = 0, 0, 0.0
+        alternatives: Dict[str, float] = {}
+        for selection in selection_set.selections:
+            condition = None
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                if name.startswith("__"):
+                    cost = Cost(1, 1, 1.0)
+                elif name not in fields:
+                    raise ValueError(f"{type_name} has no {name} field")
+                else:
+                    field_cost = fields[name]
+                    sub = Cost(0, 0, 0.0)
+                    if selection.selection_set:
+                        sub = self.selection_set(field_cost.type_name, selection.selection_set, used)
+                    multiplier = 1
+                    if field_cost.lists:
+                        multiplier = self.list_size(field_cost, selection, used)
+                        multiplier *= self.estimator.list_size ** (field_cost.lists - 1)
+                    cost = Cost(1 + sub.depth, 1 + sub.fields, multiplier * (field_cost.weight + sub.size))
+            elif isinstance(selection, InlineFragmentNode):
+                condition = selection.type_condition.name.value if selection.type_condition else None
+                cost = self.selection_set(condition or type_name, selection.selection_set, used)
+            else:
+                cost = self.fragment(selection.name.value, used)
+                condition = self.fragments[selection.name.value].type_condition.name.value
+
+            depth, count = max(depth, cost.depth), count + cost.fields
+            if condition and condition != type_name and is_object_type(self.estimator.schema.get_type(condition)):
+                alternatives[condition] = alternatives.get(condition, 0.0) + cost.size
+            else:
+                size += cost.size
+        return Cost(depth, count, size + max(alternatives.values(), default=0.0))
@@ -0,0 +1,194 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+import click
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .lazy import LazySchema
+
+# Commands a running daemon answers, the others always run in the calling process.
+FORWARD_COMMANDS = {"t", "c", "pt", "fr", "tr", "all"}
+
+
+def socket_dir(create: bool = False) -> Path:
+    """
+    Directory of the daemon sockets of this user, `create` it only accessible to them.
+
+    Raise PermissionError if it exists and other users can access it or own it, they
+    could otherwise answer the forwarded calls, and FileNotFoundError if it doesn't.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    directory = Path(runtime) / "gqlcli" if runtime else Path(tempfile.gettempdir()) / f"gqlcli-{os.getuid()}"
+    if create:
+        directory.mkdir(mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory only accessible to its owner")
+    return directory
+
+
+def socket_path(key: str, create: bool = False) -> Path:
+    """Unix socket of the daemon serving `key`, a resolved schema path or a host."""
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return socket_dir(create) / f"{digest}.sock"
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(1 << 16)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def connect(key: str) -> Optional[socket.socket]:
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    try:
+        path = socket_path(key)
+        if os.stat(path).st_uid != os.getuid():
+            return None
+    except OSError:
+        # No daemon directory or socket, or an unsafe directory.
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # Stale socket of a dead daemon.
+        sock.close()
+        return None
+    return sock
+
+
+def forward(key: str, argv: List[str]) -> Optional[Tuple[str, str, int, Optional[str]]]:
+    """
+    Run `argv` in the daemon serving `key`, return None if there is no daemon.
+
+    Besides the output and exit code, the text to copy to the clipboard is returned, the
+    daemon may not share the clipboard of the caller.
+    """
+    sock = connect(key)
+    if sock is None:
+        return None
+
+    with sock:
+        sock.sendall(json.dumps({"argv": argv, "cwd": os.getcwd()}).encode())
+        sock.shutdown(socket.SHUT_WR)
+        result = json.loads(_recv_all(sock))
+    return result["stdout"], result["stderr"], result["code"], result.get("copy")
+
+
+class Daemon:
+    """
+    Keep a schema resident and run forwarded or batched commands against it.
+
+    Path schemas are reloaded when a sdl file is added, removed or modified.
+    """
+
+    def __init__(self, key: str, make_schema: Callable[[], "LazySchema"], path: Optional[Path] = None):
+        self.key = key
+        self.make_schema = make_schema
+        self.path = path
+        self._fingerprint = None
+        self._schema: Optional["LazySchema"] = None
+
+    def fingerprint(self):
+        from .make_schema import schema_files
+
+        if self.path is None:
+            return None
+        return [(str(f), f.stat().st_mtime_ns, f.stat().st_size) for f in schema_files(self.path)]
+
+    def schema(self) -> "LazySchema":
+        fingerprint = self.fingerprint()
+        if self._schema is None or fingerprint != self._fingerprint:
+            self._schema = self.make_schema()
+            # Build now, so forwarded calls never wait for it.
+            self._schema.schema
+            self._fingerprint = fingerprint
+        return self._schema
+
+    def run(self, argv: List[str], cwd: str, obj: Optional[dict] = None) -> Tuple[str, str, int]:
+        """Run `argv` in `cwd`, commands leave what the caller should do, like copying, in `obj`."""
+        from .main import main
+
+        obj = {} if obj is None else obj
+        obj["daemon"] = self
+        stdout, stderr = io.StringIO(), io.StringIO()
+        code = 0
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                os.chdir(cwd)
+                # Without standalone mode, click returns what the command returns, or the code of ctx.exit.
+                result = main.main(argv, prog_name="gqlcli", standalone_mode=False, obj=obj)
+                code = result if isinstance(result, int) else 0
+            except click.exceptions.Exit as e:
+                code = e.exit_code
+            except SystemExit as e:
+                # A command calling sys.exit must not stop the daemon or the batch.
+                if e.code is None or isinstance(e.code, int):
+                    code = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except click.ClickException as e:
+                e.show()
+                code = e.exit_code
+            except Exception:
+                traceback.print_exc()
+                code = 1
+        return stdout.getvalue(), stderr.getvalue(), code
+
+    def serve(self):
+        try:
+            path = socket_path(self.key, create=True)
+        except PermissionError as e:
+            print(e)
+            return
+        sock = connect(self.key)
+        if sock is not None:
+            sock.close()
+            print(f"daemon for {self.key} is already running.")
+            return
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                request = json.loads(_recv_all(self.request) or b"{}")
+                if not request:
+                    return
+                obj: dict = {}
+                stdout, stderr, code = daemon.run(request["argv"], request["cwd"], obj)
+                result = {"stdout": stdout, "stderr": stderr, "code": code, "copy": obj.get("copy")}
+                self.wfile.write(json.dumps(result).encode())
+
+        self.schema()
+        # Clean the socket up on kill too.
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        with socketserver.UnixStreamServer(str(path), Handler) as server:
+            print(f"serving {self.key} on {path}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                path.unlink()
@@ -1,7 +1,9 @@
 from collections import defaultdict
-from typing import Dict, List, Union, cast
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union, cast
 
 from graphql import (
+    GraphQLArgument,
     GraphQLEnumType,
     GraphQLField,
     GraphQLInputField,
@@ -17,7 +19,6 @@ from graphql import (
     get_named_type,
     is_interface_type,
     is_leaf_type,
-    is_list_type,
     is_non_null_type,
     is_object_type,
     is_union_type,
@@ -35,6 +36,41 @@ SourceType = Union[Source, str]
 SCALAR_MAP = {'String': 'str', 'Int': 'int', 'Float': 'float', 'Boolean': 'bool', 'ID': 'int'}
 
 
+def type_shape(type_: GraphQLType) -> Tuple[str, GraphQLNamedType]:
+    """Wrapper chain of `type_`, outermost first, `!` for non null and `[` for list, and its named type."""
+    shape = ''
+    while is_wrapping_type(type_):
+        shape += '!' if is_non_null_type(type_) else '['
+        type_ = cast(GraphQLWrappingType, type_).of_type
+    return shape, cast(GraphQLNamedType, type_)
+
+
+def type_key(type_: GraphQLType) -> Tuple[str, str, bool]:
+    """What the literal of `type_` depends on: wrapper shape, named type and whether it's a leaf type."""
+    shape, named_type = type_shape(type_)
+    return shape, named_type.name, is_leaf_type(named_type)
+
+
+@lru_cache(maxsize=65536)
+def shape_literal(shape: str, name: str, leaf: bool, optional: bool = False) -> str:
+    is_null = True
+    if shape.startswith('!'):
+        shape = shape[1:]
+        is_null = False
+
+    if shape:
+        value = f'List[{shape_literal(shape[1:], name, leaf)}]'
+    else:
+        value = SCALAR_MAP.get(name) or name
+        value = value if leaf else f"'{value}'"
+        # value = value if is_leaf_type(type_) or is_interface_type(type_) else f"'{value}'"
+
+    if optional or is_null:
+        value = f'Optional[{value}]'
+
+    return value
+
+
 def get_type_literal(type_: GraphQLType, optional: bool = False) -> str:
     """
     String! => str
@@ -42,28 +78,32 @@ def get_type_literal(type_: GraphQLType, optional: bool = False) -> str:
     [Character!]! => ['Character']
     [Character!] => Optional['Character']
     [Character] => Optional[List[Optional['Character']]]
+
+    Literals are memoized by wrapper shape and named type, see `cache_stats`.
     """
-    is_null = False
-    if is_non_null_type(type_):
-        type_ = cast(GraphQLWrappingType, type_).of_type
-    else:
-        is_null = True
+    return shape_literal(*type_key(type_), optional)
 
-    if is_wrapping_type(type_):
-        type_ = cast(GraphQLWrappingType, type_)
-        value = get_type_literal(type_.of_type)
-        if is_list_type(type_):
-            value = f'List[{value}]'
-    else:
-        type_ = get_named_type(type_)
-        value = SCALAR_MAP.get(type_.name) or type_.name
-        value = value if is_leaf_type(type_) else f"'{value}'"
-        # value = value if is_leaf_type(type_) or is_interface_type(type_) else f"'{value}'"
 
-    if optional or is_null:
-        value = f'Optional[{value}]'
+ArgumentsKey = Tuple[Tuple[str, str, str, bool], ...]
 
-    return value
+
+def arguments_key(args: Dict[str, GraphQLArgument]) -> ArgumentsKey:
+    return tuple((arg_name, *type_key(arg.type)) for arg_name, arg in args.items())
+
+
+@lru_cache(maxsize=16384)
+def arguments_literal(key: ArgumentsKey) -> str:
+    args = [f'{to_snake_case(arg_name)}: {shape_literal(*type_)}' for arg_name, *type_ in key]
+    return '(parent, info, ' + ', '.join(args) + ') -> '
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit and miss counts of the rendering caches."""
+    return {
+        'to_snake_case': to_snake_case.cache_info(),
+        'type literals': shape_literal.cache_info(),
+        'argument lists': arguments_literal.cache_info(),
+    }
 
 
 # def get_type_map(source: SourceType) -> TypeMap:
@@ -85,11 +125,30 @@ def get_type_literal(type_: GraphQLType, optional: bool = False) -> str:
 #     return type_map
 
 
+TYPE_NAME_RESOLVER = """
+def _resolve_type_name(types, obj):
+    cls = type(obj)
+    if cls not in types:
+        # Closest registered base class, cached for the next objects of this class.
+        types[cls] = next((types[base] for base in cls.__mro__[1:] if base in types), None)
+    return types[cls]
+"""
+
+
 class TypeResolverGenerator:
+    """
+    Generate type resolvers of interfaces and unions.
+
+    By default they check the possible types with a chain of isinstance, with `dispatch`
+    they look the class of the object up in a module level dict instead, falling back
+    to its base classes.
+    """
+
     type_map: TypeMap
 
-    def __init__(self, type_map: TypeMap):
+    def __init__(self, type_map: TypeMap, dispatch: bool = False):
         self.type_map = type_map
+        self.dispatch = dispatch
 
     @cached_property
     def type_resolver_map(self) -> Dict[str, List[str]]:
@@ -112,16 +171,28 @@ class TypeResolverGenerator:
             print(f"No '{type_name}' type.")
             return ''
 
-        def_ = f"""
+        names = self.type_resolver_map[type_name]
+        def_ = ''
+        if self.dispatch:
+            table = f'{to_snake_case(type_name).upper()}_TYPES'
+            entries = ''.join(f"    {name}: '{name}',\n" for name in names)
+            def_ += f"\n{table} = {{\n{entries}}}\n\n" if entries else f'\n{table} = {{}}\n\n'
+        def_ += f"""
 @type_resolver('{type_name}')
 def resolve_{to_snake_case(type_name)}_type(obj, info, type_):\n"""
-        for name in self.type_resolver_map[type_name]:
-            def_ += f"    if isinstance(obj, {name}):\n\t return '{name}'\n"
+        if self.dispatch:
+            def_ += f'    return {table}.get(type(obj)) or _resolve_type_name({table}, obj)\n'
+            return def_
+        for name in names:
+            def_ += f"    if isinstance(obj, {name}):\n        return '{name}'\n"
         def_ += '    return None\n'
         return def_
 
     def all_type_resolvers(self) -> List[str]:
-        return [self.type_resolver(type_name) for type_name in self.type_resolver_map]
+        type_resolvers = [self.type_resolver(type_name) for type_name in self.type_resolver_map]
+        if self.dispatch and type_resolvers:
+            type_resolvers.insert(0, TYPE_NAME_RESOLVER)
+        return type_resolvers
 
 
 class FieldGenerator:
@@ -129,11 +200,7 @@ class FieldGenerator:
     def resolver_field(name: str, field: GraphQLField):
         return_type = get_type_literal(field.type)
         if field.args:
-            args = [
-                f'{to_snake_case(arg_name)}: {get_type_literal(arg.type)}'
-                for arg_name, arg in field.args.items()
-            ]
-            args_value = '(parent, info, ' + ', '.join(args) + ') -> '
+            args_value = arguments_literal(arguments_key(field.args))
         else:
             args_value = '(parent, info) -> '
 
@@ -144,11 +211,7 @@ class FieldGenerator:
         return_type = get_type_literal(field.type, optional=optional)
         args_value = ': '
         if field.args:
-            args = [
-                f'{to_snake_case(arg_name)}: {get_type_literal(arg.type)}'
-                for arg_name, arg in field.args.items()
-            ]
-            args_value = '(parent, info, ' + ', '.join(args) + ') -> '
+            args_value = arguments_literal(arguments_key(field.args))
 
         return f'{to_snake_case(name)}{args_value}{return_type}'
 
@@ -158,9 +221,137 @@ class FieldGenerator:
         return f"{to_snake_case(name)}: {return_type}"
 
 
+ROOT_DECORATORS = {'Query': '@query', 'Mutation': '@mutate', 'Subscription': '@subscribe'}
+
+LOADER = """
+import asyncio
+
+
+def _key(value):
+    \"\"\"Hashable form of a loader key, input objects and lists become tuples, other unhashable objects their id.\"\"\"
+    if isinstance(value, dict):
+        return tuple(sorted((name, _key(item)) for name, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_key(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return value
+
+
+class Loader:
+    \"\"\"
+    Batch the keys loaded in the same event loop iteration into one `batch_load` call.
+
+    A loader lives as long as a request, `get` keeps it in `info.context['loaders']`.
+    \"\"\"
+
+    def __init__(self):
+        # Loaded keys and their futures by hashable key, keeping the keys keeps the ids of their objects unique.
+        self.futures = {}
+        self.queue = []
+
+    @classmethod
+    def get(cls, info):
+        loaders = info.context.setdefault('loaders', {})
+        if cls not in loaders:
+            loaders[cls] = cls()
+        return loaders[cls]
+
+    def load(self, key):
+        hashable = _key(key)
+        if hashable not in self.futures:
+            loop = asyncio.get_running_loop()
+            if not self.queue:
+                loop.call_soon(self.dispatch)
+            self.futures[hashable] = (key, loop.create_future())
+            self.queue.append(hashable)
+        return self.futures[hashable][1]
+
+    def dispatch(self):
+        queue, self.queue = self.queue, []
+        asyncio.ensure_future(self.resolve(queue))
+
+    async def resolve(self, queue):
+        keys, futures = zip(*(self.futures[hashable] for hashable in queue))
+        try:
+            values = await self.batch_load(list(keys))
+            if len(values) != len(keys):
+                raise ValueError(f'{type(self).__name__}.batch_load returned {len(values)} values for {len(keys)} keys')
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, value in zip(futures, values):
+            future.set_result(value)
+
+    async def batch_load(self, keys):
+        raise NotImplementedError
+"""
+
+
+class ResolverGenerator:
+    """
+    Generate field resolver stubs.
+
+    `batched` resolvers are async, the ones of object fields load through a `Loader`
+    subclass whose keys are the parent id (or the parent) and the field arguments.
+    """
+
+    def __init__(self, batched: bool = False):
+        self.batched = batched
+
+    @staticmethod
+    def decorator(type_name: str, name: str) -> str:
+        return ROOT_DECORATORS.get(type_name, f"@field_resolver('{type_name}', '{name}')")
+
+    @staticmethod
+    def loader_keys(
+        type_: Union[GraphQLObjectType, GraphQLInterfaceType], field: GraphQLField
+    ) -> List[Tuple[str, str]]:
+        """Expression and type literal of every part of the loader key."""
+        keys = []
+        if type_.name not in ROOT_DECORATORS:
+            id_field = type_.fields.get('id')
+            keys.append(('parent.id', get_type_literal(id_field.type)) if id_field else ('parent', f"'{type_.name}'"))
+        keys.extend((to_snake_case(name), get_type_literal(arg.type)) for name, arg in field.args.items())
+        return keys
+
+    def field_resolver(self, type_: Union[GraphQLObjectType, GraphQLInterfaceType], name: str) -> str:
+        field = type_.fields[name]
+        def_ = f'{self.decorator(type_.name, name)}\ndef {FieldGenerator.resolver_field(name, field)}:\n'
+        if not self.batched:
+            return def_ + '    pass\n'
+
+        def_ = def_.replace('\ndef ', '\nasync def ', 1)
+        keys = self.loader_keys(type_, field)
+        if is_leaf_type(get_named_type(field.type)) or not keys:
+            return def_ + '    pass\n'
+
+        loader = f'{type_.name}{name[0].upper()}{name[1:]}Loader'
+        if len(keys) == 1:
+            key, key_type = keys[0]
+        else:
+            key = f"({', '.join(k for k, _ in keys)})"
+            key_type = f"Tuple[{', '.join(t for _, t in keys)}]"
+        return (
+            f'class {loader}(Loader):\n'
+            f'    async def batch_load(self, keys: List[{key_type}]) -> List[{get_type_literal(field.type)}]:\n'
+            f'        pass\n\n\n'
+            f'{def_}    return await {loader}.get(info).load({key})\n'
+        )
+
+    def all_field_resolvers(self, type_: Union[GraphQLObjectType, GraphQLInterfaceType]) -> List[str]:
+        return [self.field_resolver(type_, name) for name in type_.fields]
+
+
+KINDS = ['none', 'dataclass', 'dataclass-slots', 'namedtuple', 'msgspec', 'pydantic']
+
+
 class TypeGenerator:
     """
-    kind show type kine, may be none, dataclass or pydantic.
+    kind show type kine, may be none, dataclass, dataclass-slots, namedtuple, msgspec or pydantic.
     Example:
         none:
             class Person:
@@ -174,55 +365,84 @@ class TypeGenerator:
                 name: str
                 age: int
 
+        dataclass-slots (python 3.10+):
+            from dataclasses import dataclass
+
+            @dataclass(slots=True)
+            class Person:
+                name: str
+                age: int
+
+        namedtuple:
+            from typing import NamedTuple
+
+            class Person(NamedTuple):
+                name: str
+                age: int
+
+        msgspec:
+            from msgspec import Struct
+
+            class Person(Struct):
+                name: str
+                age: int
+
         pydantic:
             from pydantic import BaseModel
 
             class Person(BaseModel):
                 name: str
                 age: int
+
+    `frozen` makes dataclass, dataclass-slots and msgspec classes immutable. Named tuples
+    can't subclass other classes, so objects don't inherit from their interfaces there,
+    dataclass-slots and msgspec objects only inherit from their first interface.
+    `deferred` pydantic models build their validator on first use instead of at import.
     """
 
-    def __init__(self, kind: str = 'none', optional: bool = False):
+    def __init__(self, kind: str = 'none', optional: bool = False, frozen: bool = False, deferred: bool = False):
         # TODO: exception
-        assert kind in ['none', 'dataclass', 'pydantic']
+        assert kind in KINDS
         self.kind = kind
         self.optional = optional
-
-    def interface_type(self, type_: GraphQLInterfaceType):
-        def_ = f'\nclass {type_.name}'
-        if self.kind == 'dataclass':
-            def_ = '@dataclass' + def_
+        self.frozen = frozen
+        self.deferred = deferred
+
+    def class_def(self, name: str, interfaces: List[str] = None) -> str:
+        def_ = f'\nclass {name}'
+        if self.kind in ['dataclass', 'dataclass-slots']:
+            options = ['slots=True'] if self.kind == 'dataclass-slots' else []
+            if self.frozen:
+                options.append('frozen=True')
+            def_ = (f'@dataclass({", ".join(options)})' if options else '@dataclass') + def_
+
+        if interfaces and self.kind in ['dataclass-slots', 'msgspec']:
+            # Classes with slots can't have several bases with fields, the fields are declared again anyway.
+            def_ += f'({interfaces[0]})'
+        elif interfaces and self.kind != 'namedtuple':
+            def_ += f'({", ".join(interfaces)})'
         elif self.kind == 'pydantic':
-            def_ += '(BaseModel)'
-        def_ += ':\n'
+            def_ += '(BaseModel, defer_build=True)' if self.deferred else '(BaseModel)'
+        elif self.kind == 'namedtuple':
+            def_ += '(NamedTuple)'
+        elif self.kind == 'msgspec':
+            def_ += '(Struct, frozen=True)' if self.frozen else '(Struct)'
+        return def_ + ':\n'
 
+    def interface_type(self, type_: GraphQLInterfaceType):
+        def_ = self.class_def(type_.name)
         for name, field in type_.fields.items():
             def_ += f'    {FieldGenerator.output_field(name, field)}\n'
         return def_
 
     def object_type(self, type_: GraphQLObjectType):
-        def_ = f'\nclass {type_.name}'
-        if self.kind == 'dataclass':
-            def_ = '@dataclass' + def_
-
-        if type_.interfaces:
-            interfaces = ', '.join([i.name for i in type_.interfaces])
-            def_ += f'({interfaces})'
-        elif self.kind == 'pydantic':
-            def_ = def_ + '(BaseModel)'
-        def_ += ':\n'
+        def_ = self.class_def(type_.name, [i.name for i in type_.interfaces])
         for name, field in type_.fields.items():
             def_ += f'    {FieldGenerator.output_field(name, field, optional=self.optional)}\n'
         return def_
 
     def input_type(self, type_: GraphQLInputObjectType):
-        def_ = f'\nclass {type_.name}'
-        if self.kind == 'dataclass':
-            def_ = '@dataclass' + def_
-        elif self.kind == 'pydantic':
-            def_ += '(BaseModel)'
-        def_ += ':\n'
-
+        def_ = self.class_def(type_.name)
         for name, field in type_.fields.items():
             def_ += f'    {FieldGenerator.input_field(name, field)}\n'
         return def_
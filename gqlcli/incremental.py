@@ -0,0 +1,97 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+from graphql import GraphQLNamedType, get_named_type, is_enum_type, is_leaf_type, is_object_type
+
+from .cache import SchemaCache
+from .codegen import module_types
+from .generator import TypeMap, TypeResolverGenerator
+
+
+def type_signature(type_: GraphQLNamedType) -> str:
+    """
+    Everything the generated code of `type_` depends on.
+
+    That's its fields, arguments, interfaces or enum values, and whether the referenced
+    types are leaf types, which decides if their names are quoted.
+    """
+    parts = [type_.name]
+    if is_enum_type(type_):
+        parts.extend(type_.values)
+    if is_object_type(type_):
+        parts.append("&".join(i.name for i in type_.interfaces))
+    for name, field in getattr(type_, "fields", {}).items():
+        types = [field.type, *(arg.type for arg in getattr(field, "args", {}).values())]
+        parts.append(f"{name}({','.join(getattr(field, 'args', {}))})")
+        parts.extend(f"{t}{'L' if is_leaf_type(get_named_type(t)) else ''}" for t in types)
+    return "\0".join(parts)
+
+
+def digest(signature: str) -> str:
+    return hashlib.sha1(signature.encode()).hexdigest()
+
+
+class CodegenManifest:
+    """
+    Rendered types and type resolvers of the last `all --incremental` run, by structural hash.
+
+    Only types whose signature changed are rendered again, everything else is copied
+    from the manifest. It's kept in the schema cache directory under `key`.
+    """
+
+    def __init__(self, cache: SchemaCache, key: str):
+        self.cache = cache
+        self.key = key
+        entries = cache.get("codegen", key) or {}
+        self.types: Dict[str, Tuple[str, str]] = entries.get("types", {})
+        self.type_resolvers: Dict[str, Tuple[str, str]] = entries.get("type_resolvers", {})
+        self.digests: Dict[str, str] = {}
+        self.rendered = 0
+
+    def stale(self, type_map: TypeMap) -> List[str]:
+        """Names of the generated types missing from the manifest or changed since."""
+        names = []
+        for types in module_types(type_map.values()):
+            for type_ in types:
+                self.digests[type_.name] = digest(type_signature(type_))
+                entry = self.types.get(type_.name)
+                if not entry or entry[0] != self.digests[type_.name]:
+                    names.append(type_.name)
+        return names
+
+    def update(self, rendered: Dict[str, str]):
+        self.types.update((name, (self.digests[name], value)) for name, value in rendered.items())
+        self.rendered += len(rendered)
+
+    def render(self, type_: GraphQLNamedType) -> str:
+        return self.types[type_.name][1]
+
+    def type_resolver_generator(self, type_map: TypeMap, dispatch: bool = False) -> "ManifestTypeResolverGenerator":
+        return ManifestTypeResolverGenerator(type_map, self, dispatch)
+
+    def save(self):
+        """Store the entries of current types, removed ones are dropped."""
+        types = {name: self.types[name] for name in self.digests}
+        self.cache.set("codegen", self.key, {"types": types, "type_resolvers": self.type_resolvers})
+
+
+class ManifestTypeResolverGenerator(TypeResolverGenerator):
+    """Type resolvers reused from `manifest` while the possible types are the same."""
+
+    def __init__(self, type_map: TypeMap, manifest: CodegenManifest, dispatch: bool = False):
+        super().__init__(type_map, dispatch)
+        self.manifest = manifest
+        self.used: Dict[str, Tuple[str, str]] = {}
+
+    def type_resolver(self, type_name: str) -> str:
+        signature = digest("\0".join([type_name, str(self.dispatch), *self.type_resolver_map.get(type_name, [])]))
+        entry = self.manifest.type_resolvers.get(type_name)
+        if not entry or entry[0] != signature:
+            entry = (signature, super().type_resolver(type_name))
+        self.used[type_name] = entry
+        return entry[1]
+
+    def all_type_resolvers(self) -> List[str]:
+        type_resolvers = super().all_type_resolvers()
+        self.manifest.type_resolvers = self.used
+        return type_resolvers
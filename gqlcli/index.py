@@ -0,0 +1,215 @@
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from graphql import DocumentNode, GraphQLSchema, Visitor, build_ast_schema, parse, specified_scalar_types, visit
+
+from .cache import SchemaCache
+from .make_schema import merge_documents, read_source, schema_files
+
+TYPE_KINDS = {"type", "interface", "union", "enum", "input", "scalar"}
+
+_r_token = re.compile(
+    r'"""(?:\\"""|[^"]|"(?!""))*"""'  # block string
+    r'|"(?:\\.|[^"\\\n])*"'  # string
+    r"|#[^\n]*"  # comment
+    r"|[{}()]"
+    r"|@?[_A-Za-z][_0-9A-Za-z]*"
+)
+
+
+class Definition(NamedTuple):
+    kind: str
+    name: str
+    extension: bool
+    file: str
+    start: int
+    end: int
+    interfaces: Tuple[str, ...]
+
+
+def scan_definitions(body: str, file: str = "") -> Iterator[Definition]:
+    """
+    Find top level type definitions and extensions of a SDL document.
+
+    Only tokens outside of braces and parentheses are looked at, this is a lot cheaper
+    than parsing and good enough to slice a definition out of its file.
+    """
+    depth = 0
+    pending: Optional[int] = None  # start of a description before the next definition
+    current: Optional[list] = None  # kind, name, extension, start, interfaces
+    state = ""
+    implements = False
+
+    def close(end: int) -> Iterator[Definition]:
+        if current and current[0] in TYPE_KINDS and current[1]:
+            kind, name, extension, start, interfaces = current
+            yield Definition(kind, name, extension, file, start, end, tuple(interfaces))
+
+    for m in _r_token.finditer(body):
+        token = m.group()
+        c = token[0]
+        if c == "#":
+            continue
+        if c in "{(":
+            depth += 1
+            continue
+        if c in "})":
+            depth -= 1
+            continue
+        if depth:
+            continue
+        if c == '"':
+            if pending is None:
+                pending = m.start()
+            continue
+
+        if state == "kind":
+            current[0] = token
+            state = "name"
+        elif token == "extend" or token in TYPE_KINDS or token in ("schema", "directive"):
+            start = m.start() if pending is None else pending
+            yield from close(start)
+            pending = None
+            current = ["", "", token == "extend", start, []]
+            implements = False
+            if token == "extend":
+                state = "kind"
+            else:
+                current[0] = token
+                state = "name"
+        elif state == "name":
+            current[1] = token
+            state = "header"
+        elif state == "header":
+            if token == "implements":
+                implements = True
+            elif implements and c != "@":
+                current[4].append(token)
+
+    yield from close(len(body))
+
+
+class SchemaIndex:
+    """
+    Type name to SDL definitions index of a schema directory.
+
+    It's built by a fast scan of the files, so commands that need one type build a
+    small schema with that type only instead of the whole schema.
+    """
+
+    def __init__(self, definitions: Dict[str, List[Definition]]):
+        self.definitions = definitions
+
+    @classmethod
+    def from_files(cls, files: Iterable[Path]) -> "SchemaIndex":
+        definitions: Dict[str, List[Definition]] = {}
+        for file in files:
+            if file.name.startswith("_"):
+                continue
+            for definition in scan_definitions(read_source(file).body, str(file)):
+                definitions.setdefault(definition.name, []).append(definition)
+        return cls(definitions)
+
+    @classmethod
+    def from_path(cls, path: str, cache: Optional[SchemaCache] = None) -> "SchemaIndex":
+        files = schema_files(path)
+        if cache is None:
+            return cls.from_files(files)
+
+        key = cache.key(files, "index")
+        cache.save()
+        index = cache.get("index", key)
+        if index is None:
+            index = cls.from_files(files)
+            cache.set("index", key, index)
+        return index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.definitions
+
+    def kind(self, name: str) -> str:
+        return self.definitions[name][0].kind
+
+    def interfaces(self, name: str) -> List[str]:
+        return [i for d in self.definitions[name] for i in d.interfaces]
+
+    def implementations(self, name: str) -> List[str]:
+        return [
+            type_name
+            for type_name, definitions in self.definitions.items()
+            if definitions[0].kind == "type" and any(name in d.interfaces for d in definitions)
+        ]
+
+    def sdl(self, name: str, sources: Dict[str, str] = None) -> str:
+        """SDL of all definitions and extensions of `name`."""
+        sources = {} if sources is None else sources
+        parts = []
+        definitions = self.definitions[name]
+        if all(d.extension for d in definitions):
+            # e.g. Query and Mutation only extended in a schema directory.
+            parts.append(f"{definitions[0].kind} {name}")
+        for d in definitions:
+            if d.file not in sources:
+                sources[d.file] = read_source(Path(d.file)).body
+            parts.append(sources[d.file][d.start : d.end])
+        return "\n".join(parts)
+
+    def stub(self, name: str) -> str:
+        if name not in self.definitions:
+            return f"scalar {name}"
+
+        kind = self.kind(name)
+        interfaces = self.interfaces(name)
+        if interfaces:
+            return f"{kind} {name} implements {' & '.join(interfaces)}"
+        return f"{kind} {name}"
+
+    def build_schema(self, names: Iterable[str], implementations: bool = False) -> GraphQLSchema:
+        """
+        Build a schema with the full definitions of `names`.
+
+        Other referenced types are only stubs of the right kind, enough for the generators
+        to tell leaf types and interfaces apart. Input objects and enums are defined in full,
+        default values of arguments are made of them. With `implementations`, stubs of all
+        object types implementing `names` are added too.
+        """
+        names = list(names)
+        sources: Dict[str, str] = {}
+        document = parse("\n".join(self.sdl(name, sources) for name in names), no_location=True)
+
+        # Ordered, implementations keep the order of the schema.
+        referenced = named_types(document)
+        if implementations:
+            for name in names:
+                referenced.update(dict.fromkeys(self.implementations(name)))
+
+        stubs: Dict[str, str] = {}
+        todo = list(referenced)
+        while todo:
+            name = todo.pop(0)
+            if name in stubs or name in names or name in specified_scalar_types:
+                continue
+            if name in self.definitions and self.kind(name) in ("input", "enum"):
+                stubs[name] = self.sdl(name, sources)
+                todo.extend(named_types(parse(stubs[name], no_location=True)))
+                continue
+            stubs[name] = self.stub(name)
+            if name in self.definitions:
+                todo.extend(self.interfaces(name))
+
+        if stubs:
+            document = merge_documents([document, parse("\n".join(stubs.values()), no_location=True)])
+        return build_ast_schema(document, assume_valid=True, assume_valid_sdl=True)
+
+
+def named_types(document: DocumentNode) -> Dict[str, None]:
+    """Names of the types `document` refers to, in order."""
+    referenced: Dict[str, None] = {}
+
+    class NamedTypeCollector(Visitor):
+        def enter_named_type(self, node, *_args):
+            referenced[node.name.value] = None
+
+    visit(document, NamedTypeCollector())
+    return referenced
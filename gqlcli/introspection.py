@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from graphql import GraphQLSchema
+from graphql.utilities import build_client_schema, get_introspection_query
+
+from .cache import DEFAULT_TTL, SchemaCache
+
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Session reused by every introspection request of this process."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers["Accept-Encoding"] = "gzip, deflate"
+    return _session
+
+
+def fetch_introspection(host: str, etag: Optional[str] = None) -> Optional[requests.Response]:
+    """
+    POST the introspection query, return None when the server answers 304 Not Modified to
+    the revalidation of `etag`.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    resp = get_session().post(host, json={"query": get_introspection_query()}, headers=headers)
+    if resp.status_code == 304:
+        if not etag:
+            # Nothing cached to reuse, e.g. a proxy answering for another client.
+            raise RuntimeError("get_introspection_query error: 304 Not Modified without a cached schema")
+        return None
+    if not resp.ok:
+        raise RuntimeError(f"get_introspection_query error: {resp.text}")
+    return resp
+
+
+def build_client_schema_with_host(
+    host: str,
+    cache: Optional[SchemaCache] = None,
+    ttl: int = DEFAULT_TTL,
+    refresh: bool = False,
+) -> GraphQLSchema:
+    """
+    Build schema from the introspection result of `host`.
+
+    With `cache`, the result is kept on disk for `ttl` seconds and revalidated with
+    `If-None-Match` afterwards, `refresh` forces a revalidation.
+    """
+    key = hashlib.sha256(host.encode()).hexdigest()
+    entry: Optional[Dict[str, Any]] = cache.get("introspection", key) if cache else None
+
+    if entry and not refresh and time.time() - entry["fetched_at"] < ttl:
+        return build_client_schema(entry["data"])
+
+    resp = fetch_introspection(host, entry["etag"] if entry else None)
+    if resp is not None:
+        entry = {"etag": resp.headers.get("ETag"), "data": resp.json()["data"]}
+    entry["fetched_at"] = time.time()
+
+    if cache:
+        cache.set("introspection", key, entry)
+    return build_client_schema(entry["data"])
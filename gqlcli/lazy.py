@@ -0,0 +1,95 @@
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional
+
+import click
+from graphql import GraphQLSchema
+from graphql.pyutils.cached_property import cached_property
+
+from .cache import SchemaCache
+from .index import SchemaIndex
+from .reachable import TypeGraph
+from .utils import peak_rss
+
+
+class LazySchema:
+    """
+    Schema handle which is only built when a command needs it.
+
+    Commands that need a few types get a small schema from `type_schema`, served by the
+    type index when there is one, so they don't pay for building the whole schema.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], GraphQLSchema],
+        load_index: Optional[Callable[[], SchemaIndex]] = None,
+        debug: bool = False,
+    ):
+        self.load = load
+        self.load_index = load_index
+        self.debug = debug
+
+    def _log(self, message: str, start: float):
+        if self.debug:
+            elapsed = time.perf_counter() - start
+            click.echo(f"{message} in {elapsed:.3f}s, peak RSS {peak_rss() / 2 ** 20:.1f} MB", err=True)
+
+    @cached_property
+    def schema(self) -> GraphQLSchema:
+        start = time.perf_counter()
+        schema = self.load()
+        self._log("schema loaded", start)
+        return schema
+
+    @cached_property
+    def index(self) -> Optional[SchemaIndex]:
+        if self.load_index is None:
+            return None
+        start = time.perf_counter()
+        index = self.load_index()
+        self._log("type index loaded", start)
+        return index
+
+    @cached_property
+    def type_graph(self) -> TypeGraph:
+        start = time.perf_counter()
+        type_graph = TypeGraph(self.schema)
+        self._log("type graph indexed", start)
+        return type_graph
+
+    def type_schema(self, *names: str, implementations: bool = False) -> GraphQLSchema:
+        """Schema with the full definitions of `names`, see `SchemaIndex.build_schema`."""
+        if "schema" in self.__dict__ or self.index is None or not all(name in self.index for name in names):
+            return self.schema
+
+        start = time.perf_counter()
+        schema = self.index.build_schema(names, implementations)
+        self._log(f"{', '.join(names)} built from index", start)
+        return schema
+
+
+def schema_loader(
+    host: Optional[str],
+    path: Optional[Path],
+    cache: Optional[SchemaCache],
+    ttl: int,
+    refresh: bool = False,
+    jobs: int = 1,
+    debug: bool = False,
+) -> Callable[[], LazySchema]:
+    """Factory of lazy schemas of `host` or else the schema file or directory `path`."""
+    if host:
+        from .introspection import build_client_schema_with_host
+
+        return partial(LazySchema, partial(build_client_schema_with_host, host, cache, ttl, refresh), debug=debug)
+
+    from .make_schema import make_schema_from_path
+
+    return partial(
+        LazySchema,
+        partial(make_schema_from_path, path, assume_valid=True, cache=cache, jobs=jobs),
+        partial(SchemaIndex.from_path, path, cache),
+        debug=debug,
+    )
@@ -1,42 +1,73 @@
+# graphql-core, requests, pyclip and prompt_toolkit are imported by the commands using them,
+# so --help, shell completion and calls forwarded to a daemon start fast.
+import sys
+import time
 from functools import partial
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Tuple
 
 import click
-import pyclip
-import requests
-from graphql import (
-    GraphQLEnumType,
-    GraphQLInputObjectType,
-    GraphQLInterfaceType,
-    GraphQLObjectType,
-    GraphQLSchema,
-    assert_interface_type,
-    assert_object_type,
-)
-from graphql import build_schema as _build_schema
-from graphql import is_enum_type, is_input_object_type, is_interface_type, is_object_type, print_type
-from graphql.utilities import build_client_schema, get_introspection_query
 
-from .generator import FieldGenerator, TypeGenerator, TypeResolverGenerator
-from .interactive import make_app
-from .make_schema import make_schema_from_path
-from .print import print_query
+from .cache import DEFAULT_CACHE_DIR, DEFAULT_TTL, SchemaCache
+from .daemon import FORWARD_COMMANDS, Daemon, forward
+
+# Commands which don't work on a schema.
+STANDALONE_COMMANDS = {"synth", "batch"}
+
+if TYPE_CHECKING:  # pragma: no cover
+    from graphql import GraphQLSchema
+
+    from .generator import TypeMap
 
-build_schema = partial(_build_schema, assume_valid_sdl=True)
 
+def find_schema_path(path: str) -> Optional[Path]:
+    current_dir = Path(".")
+
+    if not path:
+        directory = current_dir / "schema"
+        file = Path(".") / "schema.graphql"
+    else:
+        directory = current_dir / path
+        file = current_dir / f"{path}"
 
-def build_client_schema_with_host(host: str) -> GraphQLSchema:
-    query = get_introspection_query()
-    data = {"query": query}
-    resp = requests.post(host, json=data)
-    if not resp.ok:
-        raise RuntimeError(f"get_introspection_query error: {resp.text}")
-    data = resp.json()["data"]
-    return build_client_schema(resp.json()["data"])
+    if file.exists() and file.is_file():
+        return file
 
+    if directory.exists() and directory.is_dir():
+        return directory
 
-@click.group()
+    print("Must has 'path' argument or has a graphql sdl file schema.graphql " "or has a schema directory")
+    return None
+
+
+def print_cache_stats():
+    """Print hit rates of the code generation caches, if code was generated."""
+    generator = sys.modules.get("gqlcli.generator")
+    if generator is None:
+        return
+    for name, info in generator.cache_stats().items():
+        calls = info.hits + info.misses
+        rate = info.hits / calls if calls else 0
+        click.echo(f"{name}: {info.hits} hits, {info.misses} misses ({rate:.0%}), {info.currsize} cached", err=True)
+
+
+class Group(click.Group):
+    def parse_args(self, ctx, args):
+        # Keep the raw arguments, to forward them to a running daemon.
+        ctx.meta["argv"] = list(args)
+        return super().parse_args(ctx, args)
+
+
+def watch_schema(ctx) -> Iterable["GraphQLSchema"]:
+    from .watch import SchemaWatcher
+
+    if "path" not in ctx.obj:
+        print("--watch needs a schema file or directory.")
+        return []
+    return SchemaWatcher(ctx.obj["path"])
+
+
+@click.group(cls=Group)
 @click.option(
     "-p",
     "--path",
@@ -45,34 +76,74 @@ def build_client_schema_with_host(host: str) -> GraphQLSchema:
     'if not present, auto find "schema" directory and "schema.graphql"',
 )
 @click.option("-h", "--host", help="graphql server host ")
+@click.option(
+    "--ttl",
+    default=DEFAULT_TTL,
+    type=int,
+    show_default=True,
+    help="seconds to reuse cached host introspection before revalidating",
+)
+@click.option("--refresh", default=False, is_flag=True, help="revalidate cached host introspection")
+@click.option(
+    "--cache-dir",
+    default=DEFAULT_CACHE_DIR,
+    envvar="GQLCLI_CACHE_DIR",
+    show_default=True,
+    help="directory to cache compiled schema",
+)
+@click.option("--no-cache", default=False, is_flag=True, help="disable compiled schema cache")
+@click.option("-j", "--jobs", default=1, type=int, help="parse schema directory files in N processes")
+@click.option(
+    "--debug",
+    default=False,
+    is_flag=True,
+    help="print schema loading time, peak memory and code generation cache stats to stderr",
+)
 @click.pass_context
-def main(ctx, path, host):
+def main(ctx, path, host, ttl, refresh, cache_dir, no_cache, jobs, debug):
     # ensure that ctx.obj exists and is a dict (in case `cli()` is called
     # by means other than the `if` block below)
     ctx.ensure_object(dict)
+    ctx.obj["debug"] = debug
+    if debug:
+        ctx.call_on_close(print_cache_stats)
+    if ctx.invoked_subcommand in STANDALONE_COMMANDS:
+        return
 
     if host:
-        ctx.obj["schema"] = build_client_schema_with_host(host)
+        key = host
+    else:
+        schema_path = find_schema_path(path)
+        if not schema_path:
+            return
+        schema_path = schema_path.resolve()
+        key = str(schema_path)
+        ctx.obj["path"] = schema_path
+    ctx.obj["key"] = key
+    ctx.obj["cache"] = cache = None if no_cache else SchemaCache(cache_dir)
+
+    daemon = ctx.obj.get("daemon")
+    if daemon and daemon.key == key:
+        ctx.obj["schema"] = daemon.schema()
         return
 
-    current_dir = Path(".")
-
-    if not path:
-        directory = current_dir / "schema"
-        file = Path(".") / "schema.graphql"
-    else:
-        directory = current_dir / path
-        file = current_dir / f"{path}"
+    if not daemon and ctx.invoked_subcommand in FORWARD_COMMANDS and "--watch" not in ctx.meta["argv"]:
+        result = forward(key, ctx.meta["argv"])
+        if result is not None:
+            stdout, stderr, code, copy = result
+            click.echo(stdout, nl=False)
+            click.echo(stderr, nl=False, err=True)
+            if copy is not None:
+                import pyclip
 
-    if file.exists() and file.is_file():
-        ctx.obj["schema"] = make_schema_from_path(file, assume_valid=True)
-        return
+                pyclip.copy(copy)
+            ctx.exit(code)
 
-    if directory.exists() and directory.is_dir():
-        ctx.obj["schema"] = make_schema_from_path(directory, assume_valid=True)
-        return
+    from .lazy import schema_loader
 
-    print("Must has 'path' argument or has a graphql sdl file schema.graphql " "or has a schema directory")
+    make_schema = schema_loader(host, None if host else schema_path, cache, ttl, refresh, jobs, debug)
+    ctx.obj["make_schema"] = make_schema
+    ctx.obj["schema"] = make_schema()
 
 
 @main.command(name="t")
@@ -80,35 +151,41 @@ def main(ctx, path, host):
 @click.option(
     "--kind",
     default="pydantic",
-    help="generate class based: none, dataclass, pydantic, default is pydantic",
+    help="generate class based: none, dataclass, dataclass-slots, namedtuple, msgspec, pydantic, default is pydantic",
 )
+@click.option("--frozen", default=False, is_flag=True, help="immutable dataclass, dataclass-slots or msgspec classes")
 @click.option("--optional", default=False, is_flag=True, help="all field optional")
 @click.option("--enum", default="str", help="enum type: str, number, default is str")
+@click.option("--watch", default=False, is_flag=True, help="regenerate when schema files change")
 @click.argument("typ", nargs=-1)
-def type(ctx, typ: str, kind: str, optional: bool, enum: str):
+def type(ctx, typ: str, kind: str, frozen: bool, optional: bool, enum: str, watch: bool):
     """Generate one type"""
-    generator = TypeGenerator(kind, optional=optional)
-    type_map = ctx.obj["schema"].type_map
+    from .codegen import render_type
+    from .generator import KINDS, TypeGenerator
+    from .watch import RenderCache
+
+    if kind not in KINDS:
+        print(f"KIND must be {', '.join(KINDS)}")
+        return
+
+    generator = TypeGenerator(kind, optional=optional, frozen=frozen)
+    if watch:
+        render = RenderCache(partial(render_type, generator, enum=enum))
+        for schema in watch_schema(ctx):
+            render.prune(schema.type_map)
+            rendered = render.rendered
+            type_defs = [render(schema.type_map[t]) for t in typ if t in schema.type_map]
+            if render.rendered != rendered:
+                print("\n".join(type_defs))
+        return
+
+    type_map = ctx.obj["schema"].type_schema(*typ).type_map
     for t in typ:
         if t not in type_map:
             print(f"No '{t}' type.")
             return
 
-        type_ = type_map[t]
-        type_def = ""
-        if is_enum_type(type_):
-            if enum == "str":
-                type_def = generator.str_enum_type(cast(GraphQLEnumType, type_))
-            elif enum == "number":
-                type_def = generator.number_enum_type(cast(GraphQLEnumType, type_))
-        elif is_object_type(type_):
-            type_def = generator.object_type(cast(GraphQLObjectType, type_))
-        elif is_interface_type(type_):
-            type_def = generator.interface_type(cast(GraphQLInterfaceType, type_))
-        elif is_input_object_type(type_):
-            type_def = generator.input_type(cast(GraphQLInputObjectType, type_))
-
-        print(type_def)
+        print(render_type(generator, type_map[t], enum))
 
 
 @main.command()
@@ -116,64 +193,149 @@ def type(ctx, typ: str, kind: str, optional: bool, enum: str):
 @click.option(
     "--kind",
     default="pydantic",
-    help="generate class based: none, dataclass, pydantic, default is pydantic",
+    help="generate class based: none, dataclass, dataclass-slots, namedtuple, msgspec, pydantic, default is pydantic",
 )
-def all(ctx, kind: str):
+@click.option("--frozen", default=False, is_flag=True, help="immutable dataclass, dataclass-slots or msgspec classes")
+@click.option("--watch", default=False, is_flag=True, help="regenerate when schema files change")
+@click.option("--out", help="write a python package to this directory instead of printing")
+@click.option(
+    "--split",
+    default="none",
+    show_default=True,
+    help="with --out, one module for all types (none), per type (type) or per sdl file (file)",
+)
+@click.option("-j", "--jobs", default=1, show_default=True, help="render types in N processes, ignored with --watch")
+@click.option("--incremental", default=False, is_flag=True, help="only render types changed since the last run")
+@click.option("--dispatch", default=False, is_flag=True, help="type resolvers look up a dict of classes, no isinstance")
+@click.option(
+    "--from",
+    "from_fields",
+    help="only types reachable from these root fields, e.g. Query.user,Mutation.createOrder or Query",
+)
+@click.option("--reachable", default=False, is_flag=True, help="only types reachable from any root field")
+@click.option(
+    "--fast-import",
+    default=False,
+    is_flag=True,
+    help="classes in dependency order with deferred annotations, pydantic models built on first use",
+)
+def all(
+    ctx,
+    kind: str,
+    frozen: bool,
+    watch: bool,
+    out: Optional[str],
+    split: str,
+    jobs: int,
+    incremental: bool,
+    dispatch: bool,
+    from_fields: Optional[str],
+    reachable: bool,
+    fast_import: bool,
+):
     """Generate all schema types"""
-    if kind not in ["none", "dataclass", "pydantic"]:
-        print("KIND must be none, dataclass or pydantic")
+    from .codegen import module_types, render_type, render_types, write_module
+    from .generator import KINDS, TypeGenerator, TypeResolverGenerator
+    from .output import SPLITS, ModuleWriter, has_locations
+    from .reachable import TypeGraph
+    from .watch import RenderCache
+
+    if kind not in KINDS:
+        print(f"KIND must be {', '.join(KINDS)}")
+        return
+    if split not in SPLITS:
+        print("SPLIT must be none, type or file")
+        return
+    if fast_import and split != "none":
+        print("--fast-import orders the classes of one module, it can't be used with --split type or file")
         return
 
-    generator = TypeGenerator(kind)
+    generator = TypeGenerator(kind, frozen=frozen, deferred=fast_import)
+    render = partial(render_type, generator)
+    if watch:
+        render = RenderCache(render)
+
+    def select(schema: "GraphQLSchema", type_graph: Optional[TypeGraph] = None) -> "TypeMap":
+        if not from_fields and not reachable:
+            return schema.type_map
+        type_graph = type_graph or TypeGraph(schema)
+        if from_fields:
+            return type_graph.prune(type_graph.root_types(from_fields.split(",")))
+        return type_graph.prune(type_graph.operation_root_types())
+
+    def generate(type_map: "TypeMap", render: Callable, type_resolvers=None):
+        type_resolvers = type_resolvers or TypeResolverGenerator(type_map, dispatch)
+        if out:
+            if split == "file" and not has_locations(t for types in module_types(type_map.values()) for t in types):
+                print("--split file needs the sdl file of every type, schemas from a host or parsed with -j have none")
+                return
+            writer = ModuleWriter(Path(out), kind, split, render, ctx.obj.get("path"), fast_import)
+            writer.write(type_map, type_resolvers)
+            click.echo(f"{writer.written} files written, {writer.unchanged} unchanged", err=True)
+        else:
+            write_module(sys.stdout, type_map, kind, render, type_resolvers, fast_import)
+            print()
+
+    if watch:
+        for schema in watch_schema(ctx):
+            try:
+                type_map = select(schema)
+            except ValueError as e:
+                print(e)
+                continue
+            start, rendered = time.perf_counter(), render.rendered
+            render.prune(type_map)
+            generate(type_map, render)
+            elapsed = time.perf_counter() - start
+            click.echo(f"regenerated {render.rendered - rendered} types in {elapsed:.3f}s", err=True)
+        return
 
-    enum_types, interface_types, object_types, input_types = [], [], [], []
-    type_map = ctx.obj["schema"].type_map
-    for name, type_ in type_map.items():
-        if name in ["Query", "Mutation"] or name.startswith("__"):
-            continue
-        elif is_enum_type(type_):
-            enum_types.append(generator.str_enum_type(cast(GraphQLEnumType, type_)))
-        elif is_object_type(type_):
-            object_types.append(generator.object_type(cast(GraphQLObjectType, type_)))
-        elif is_interface_type(type_):
-            interface_types.append(generator.interface_type(cast(GraphQLInterfaceType, type_)))
-        elif is_input_object_type(type_):
-            input_types.append(generator.input_type(cast(GraphQLInputObjectType, type_)))
-
-    type_resolvers = TypeResolverGenerator(type_map).all_type_resolvers()
-    imports, body = "", ""
-
-    if enum_types:
-        body += "\n".join(enum_types) + "\n"
-    if interface_types:
-        body += "\n".join(interface_types) + "\n"
-    if object_types:
-        body += "\n".join(object_types) + "\n"
-    if input_types:
-        body += "\n".join(input_types)
-    if type_resolvers:
-        body += "\n".join(type_resolvers)
-
-    if kind == "dataclass":
-        imports += "from dataclasses import dataclass\n"
-    if enum_types:
-        imports += "from enum import Enum\n"
-    imports += "from typing import Any, Dict, List, NewType, Optional, Union\n\n"
-    imports += "from gql import enum_type, type_resolver\n"
-    if kind == "pydantic":
-        imports += "from pydantic import BaseModel\n"
-    imports += "\n"
-
-    print(imports + body)
+    schema = ctx.obj["schema"].schema
+    try:
+        type_map = select(schema, ctx.obj["schema"].type_graph if from_fields or reachable else None)
+    except ValueError as e:
+        print(e)
+        return
+    names = None
+    if type_map is not schema.type_map:
+        names = [type_.name for types in module_types(type_map.values()) for type_ in types]
+    if incremental:
+        from .incremental import CodegenManifest
+
+        if ctx.obj["cache"] is None:
+            print("--incremental keeps its manifest in the cache, it can't be used with --no-cache")
+            return
+        # Pruned runs keep their own manifest, so they don't evict the types of full runs.
+        key = ctx.obj["cache"].key([], ctx.obj["key"], kind, frozen, fast_import, from_fields or "", reachable)
+        manifest = CodegenManifest(ctx.obj["cache"], key)
+        manifest.update(render_types(schema, generator, jobs, manifest.stale(type_map)))
+        generate(type_map, manifest.render, manifest.type_resolver_generator(type_map, dispatch))
+        manifest.save()
+        click.echo(f"rendered {manifest.rendered} of {len(manifest.digests)} types", err=True)
+    elif jobs > 1:
+        rendered = render_types(schema, generator, jobs, names)
+        generate(type_map, lambda type_: rendered[type_.name])
+    else:
+        generate(type_map, render)
 
 
 @main.command(name="fr")
 @click.pass_context
+@click.option("--batched", default=False, is_flag=True, help="async resolvers, object fields load through a Loader")
+@click.option("--all", "all_fields", default=False, is_flag=True, help="resolvers of every field of TYPE")
 @click.argument("type")
-@click.argument("field")
-def field_resolver(ctx, type: str, field: str):
+@click.argument("field", required=False)
+def field_resolver(ctx, type: str, field: Optional[str], batched: bool, all_fields: bool):
     """Generate field resolver."""
-    schema = ctx.obj["schema"]
+    from graphql import assert_interface_type, assert_object_type, is_interface_type, is_object_type
+
+    from .generator import LOADER, ResolverGenerator
+
+    if not field and not all_fields:
+        print("FIELD is required without --all")
+        return
+
+    schema = ctx.obj["schema"].type_schema(type)
     type_ = schema.get_type(type)
     if is_object_type(type_):
         type_ = assert_object_type(type_)
@@ -183,48 +345,210 @@ def field_resolver(ctx, type: str, field: str):
         print(f"{type} is not type or not object type or not interface type")
         return
 
-    field_ = type_.fields.get(field)
-    if not field:
+    if not all_fields and field not in type_.fields:
         print(f"{type} has no {field} field")
         return
 
-    if type == "Query":
-        output = "@query\ndef "
-    elif type == "Mutation":
-        output = "@mutate\ndef "
-    elif type == "Subscription":
-        output = "@subscribe\ndef "
-    else:
-        output = f"@field_resolver('{type}', '{field}')\ndef "
-    output += FieldGenerator.resolver_field(field, field_) + ":\n    pass\n"
-    print(output)
+    generator = ResolverGenerator(batched)
+    resolvers = generator.all_field_resolvers(type_) if all_fields else [generator.field_resolver(type_, field)]
+    if batched and any("(Loader)" in resolver for resolver in resolvers):
+        print(LOADER.strip() + "\n\n")
+    print("\n\n".join(resolvers))
 
 
 @main.command(name="tr")
 @click.pass_context
+@click.option("--dispatch", default=False, is_flag=True, help="look up a dict of classes, no isinstance")
 @click.argument("type_name")
-def type_resolver(ctx, type_name: str):
+def type_resolver(ctx, type_name: str, dispatch: bool):
     """Generate type resolver"""
-    generator = TypeResolverGenerator(ctx.obj["schema"].type_map)
-    print(generator.type_resolver(type_name))
+    from .generator import TYPE_NAME_RESOLVER, TypeResolverGenerator
+
+    schema = ctx.obj["schema"].type_schema(type_name, implementations=True)
+    generator = TypeResolverGenerator(schema.type_map, dispatch)
+    type_resolver = generator.type_resolver(type_name)
+    if dispatch and type_resolver:
+        print(TYPE_NAME_RESOLVER)
+    print(type_resolver)
 
 
 @main.command(name="c")
 @click.pass_context
-@click.argument("op")
-def client(ctx, op: str):
+@click.option("--watch", default=False, is_flag=True, help="regenerate when schema files change")
+@click.option("--fragments", default=False, is_flag=True, help="select every type through one named fragment")
+@click.option("--max-depth", type=click.IntRange(min=1), help="max nesting of fields, implies --fragments")
+@click.option("--max-fields", type=click.IntRange(min=1), help="max fields of the query, implies --fragments")
+@click.option("--all", "all_operations", default=False, is_flag=True, help="a document for every root field")
+@click.option("--out", help="with --all, write the .graphql documents to this directory")
+@click.option("-j", "--jobs", default=1, show_default=True, help="with --all, print in N processes")
+@click.option("--minify", default=False, is_flag=True, help="remove insignificant whitespace from documents")
+@click.option("--manifest", help="with --all, write the persisted query manifest, minified documents by sha256")
+@click.option("--no-copy", default=False, is_flag=True, help="don't copy the query to the clipboard")
+@click.argument("op", required=False)
+def client(
+    ctx,
+    op: Optional[str],
+    watch: bool,
+    fragments: bool,
+    max_depth: Optional[int],
+    max_fields: Optional[int],
+    all_operations: bool,
+    out: Optional[str],
+    jobs: int,
+    minify: bool,
+    manifest: Optional[str],
+    no_copy: bool,
+):
     """Generate client query"""
-    schema: GraphQLSchema = ctx.obj["schema"]
+    from .print import FragmentQueryPrinter
+    from .print import print_query as print_tree_query
+
+    fragments = fragments or bool(max_depth or max_fields)
+    if all_operations:
+        if op or not out:
+            print("--all writes every operation, it needs --out and no OP")
+            return
+        from .operations import OperationPrinter, write_operations
+
+        manifest_path = Path(manifest) if manifest else None
+
+        def write(schema: "GraphQLSchema", jobs: int = 1):
+            start = time.perf_counter()
+            printer = OperationPrinter(schema, fragments, max_depth, max_fields)
+            written, unchanged, skipped = write_operations(Path(out), printer, jobs, minify, manifest_path)
+            elapsed = time.perf_counter() - start
+            summary = f"{written} files written, {unchanged} unchanged"
+            if skipped:
+                summary += f", {skipped} skipped as no field fits the budgets"
+            click.echo(f"{summary} in {elapsed:.3f}s", err=True)
+
+        if watch:
+            for schema in watch_schema(ctx):
+                write(schema)
+        else:
+            write(ctx.obj["schema"].schema, jobs)
+        return
+    if not op or manifest:
+        print("OP is required without --all, --manifest needs --all")
+        return
+
+    def print_query(schema, op: str) -> str:
+        if fragments:
+            query = FragmentQueryPrinter(schema, max_depth, max_fields).print_query(op)
+        else:
+            query = print_tree_query(schema, op)
+        if minify and query.startswith(("query", "mutation", "subscription")):
+            from .operations import minify as minify_document
+
+            query = minify_document(query)
+        return query
+
+    if watch:
+        result = None
+        for schema in watch_schema(ctx):
+            query = print_query(schema, op)
+            if query != result:
+                result = query
+                print(result)
+        return
+
+    schema = ctx.obj["schema"].schema
     result = print_query(schema, op)
     print(result)
-    pyclip.copy(result)
+    if no_copy:
+        return
+    if ctx.obj.get("daemon"):
+        # The caller copies, the clipboard of the daemon may not be theirs.
+        ctx.obj["copy"] = result
+    else:
+        import pyclip
+
+        pyclip.copy(result)
+
+
+@main.command(name="cost")
+@click.pass_context
+@click.option("--list-size", default=10, show_default=True, help="size of lists without @listSize")
+@click.option("--variables", help="JSON object of variables, slicing arguments take their values")
+@click.option("--max-cost", type=float, help="exit with 1 if an operation costs more")
+@click.argument("files", nargs=-1, type=click.Path(exists=True))
+def cost(ctx, list_size: int, variables: Optional[str], max_cost: Optional[float], files: Tuple[str, ...]):
+    """
+    Estimate depth, fields and result size of operations.
+
+    FILES are .graphql files or directories of them, operations are read from stdin without FILES.
+    """
+    import json
+
+    from graphql import GraphQLError, parse
+
+    from .cost import CostEstimator
+
+    documents = []
+    for file in files:
+        path = Path(file)
+        documents.extend(sorted(path.glob("**/*.graphql")) if path.is_dir() else [path])
+    estimator = CostEstimator(ctx.obj["schema"].schema, list_size, json.loads(variables) if variables else None)
+
+    if files and not documents:
+        print("No .graphql files in " + ", ".join(files))
+        ctx.exit(1)
+
+    rows, failed = [], 0
+    for document in documents or [None]:
+        label = str(document) if document else "<stdin>"
+        try:
+            source = document.read_text() if document else sys.stdin.read()
+            costs = estimator.estimate(parse(source))
+        except (GraphQLError, ValueError) as e:
+            print(f"{label}: {e}")
+            failed += 1
+            continue
+        rows.extend((name if len(documents) <= 1 else f"{label}:{name}", c) for name, c in costs.items())
+
+    width = max([len(name) for name, _ in rows] + [9])
+    if rows:
+        print(f"{'operation':<{width}} {'depth':>6} {'fields':>8} {'size':>14}")
+    over = 0
+    for name, c in rows:
+        mark = ""
+        if max_cost is not None and c.size > max_cost:
+            mark, over = " over --max-cost", over + 1
+        print(f"{name:<{width}} {c.depth:>6} {c.fields:>8} {c.size:>14,.0f}{mark}")
+    if failed or over:
+        ctx.exit(1)
+
+
+@main.command(name="postman")
+@click.pass_context
+@click.option("-H", "--header", "headers", multiple=True, help='request header, e.g. "Authorization: Token {{TOKEN}}"')
+@click.option("--out", help="write the collection to this file instead of printing")
+@click.argument("name")
+def postman(ctx, headers: Tuple[str, ...], out: Optional[str], name: str):
+    """Export all client query to postman."""
+    from .output import atomic_write
+    from .postman import write_collection
+
+    for header in headers:
+        if ":" not in header:
+            print(f"Header {header} must be NAME:VALUE")
+            return
+
+    schema = ctx.obj["schema"].schema
+    write = partial(write_collection, schema=schema, name=name, headers=list(headers))
+    if out:
+        atomic_write(Path(out), write)
+    else:
+        write(sys.stdout)
 
 
 @main.command(name="i")
 @click.pass_context
 def interactive(ctx):
     """Interactive mode."""
-    schema: GraphQLSchema = ctx.obj["schema"]
+    from .interactive import make_app
+
+    schema = ctx.obj["schema"].schema
 
     app = make_app(schema)
     app.run()
@@ -235,9 +559,73 @@ def interactive(ctx):
 @click.argument("type_name")
 def print_graphql_type(ctx, type_name: str):
     """Print type definition"""
-    schema = ctx.obj["schema"]
+    from graphql import print_type
+
+    schema = ctx.obj["schema"].type_schema(type_name)
     type_ = schema.get_type(type_name)
     if not type_:
         print(f"No {type_name} type.")
         return
     print(print_type(type_))
+
+
+@main.command()
+@click.pass_context
+def daemon(ctx):
+    """Keep schema loaded and answer t, c, pt, fr, tr and all calls."""
+    Daemon(ctx.obj["key"], ctx.obj["make_schema"], ctx.obj.get("path")).serve()
+
+
+@main.command()
+@click.option("--types", default=100, show_default=True, help="number of types")
+@click.option("--fields", default=10, show_default=True, help="fields per object type")
+@click.option("--files", default=1, show_default=True, help="split the schema into N files, needs --out")
+@click.option("--seed", default=0, show_default=True, help="random seed")
+@click.option("--federation", is_flag=True, help="make object types federation entities")
+@click.option("--out", help="write sdl files to this directory instead of printing")
+def synth(types: int, fields: int, files: int, seed: int, federation: bool, out: str):
+    """Generate a synthetic schema for benchmarks."""
+    from .synth import synth_schema, write_synth_schema
+
+    if out:
+        write_synth_schema(Path(out), types, fields, files, seed, federation)
+    else:
+        print(synth_schema(types, fields, seed, federation))
+
+
+@main.command()
+@click.pass_context
+@click.option("-j", "--workers", type=int, help="worker processes, default is the workers of the config or all cores")
+@click.argument("config", type=click.Path(exists=True, dir_okay=False))
+def batch(ctx, config: str, workers: Optional[int]):
+    """Run the gqlcli calls of a TOML config in one process."""
+    from .batch import load_config, run_batch
+    from .output import atomic_write
+
+    settings = ctx.parent.params
+    global_args = ["--cache-dir", settings["cache_dir"], "--ttl", str(settings["ttl"])]
+    global_args.extend(f"--{flag.replace('_', '-')}" for flag in ["no_cache", "refresh", "debug"] if settings[flag])
+    try:
+        jobs, config_workers = load_config(Path(config), global_args)
+    except ValueError as e:
+        print(e)
+        return
+
+    start = time.perf_counter()
+    results = run_batch(jobs, settings, str(Path(config).resolve().parent), workers or config_workers)
+    failed = 0
+    for job, (stdout, stderr, code) in zip(jobs, results):
+        if job.output:
+            job.output.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(job.output, lambda out: out.write(stdout))
+        else:
+            click.echo(stdout, nl=False)
+        click.echo(stderr, nl=False, err=True)
+        if code:
+            failed += 1
+            click.echo(f"failed: gqlcli {' '.join(job.argv)}", err=True)
+
+    elapsed = time.perf_counter() - start
+    click.echo(f"{len(jobs)} jobs in {elapsed:.2f}s, {failed} failed", err=True)
+    if failed:
+        ctx.exit(1)
@@ -1,15 +1,23 @@
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Type, Union, cast
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type, Union, cast
 
 from graphql import (
+    DocumentNode,
+    GraphQLError,
     GraphQLObjectType,
     GraphQLSchema,
     GraphQLUnionType,
+    Source,
+    build_ast_schema,
     build_schema,
     extend_schema,
     parse,
+    print_ast,
 )
 
+from .cache import SchemaCache
 from .federation import (
     federation_entity_type_defs,
     federation_service_type_defs,
@@ -17,7 +25,6 @@ from .federation import (
     purge_schema_directives,
     resolve_entities,
 )
-
 from .schema_visitor import SchemaDirectiveVisitor
 
 
@@ -25,8 +32,13 @@ def join_type_defs(type_defs: List[str]) -> str:
     return "\n\n".join(t.strip() for t in type_defs)
 
 
+def merge_documents(documents: List[DocumentNode]) -> DocumentNode:
+    """Merge the definitions of several documents into one, keeping their locations."""
+    return DocumentNode(definitions=tuple(d for document in documents for d in document.definitions))
+
+
 def make_schema(
-    type_defs: Union[str, List[str]],
+    type_defs: Union[str, List[str], DocumentNode],
     assume_valid: bool = False,
     assume_valid_sdl: bool = False,
     no_location: bool = False,
@@ -38,6 +50,9 @@ def make_schema(
         type_defs = join_type_defs(type_defs)
 
     if federation:
+        if isinstance(type_defs, DocumentNode):
+            type_defs = print_ast(type_defs)
+
         # Remove custom schema directives (to avoid apollo-gateway crashes).
         sdl = purge_schema_directives(type_defs)
 
@@ -72,6 +87,8 @@ def make_schema(
         if query_type:
             query_type = cast(GraphQLObjectType, query_type)
             query_type.fields["_service"].resolve = lambda _service, info: {"sdl": sdl}
+    elif isinstance(type_defs, DocumentNode):
+        schema = build_ast_schema(type_defs, assume_valid, assume_valid_sdl)
     else:
         schema = build_schema(
             type_defs,
@@ -108,21 +125,74 @@ def make_schema_from_file(
         return schema
 
 
-def parse_from_file(file: Path):
+def read_source(file: Path) -> Source:
+    """
+    Load `file` as a graphql Source.
+
+    The file is memory-mapped and decoded once, comments and whitespace are left to
+    the lexer, so block strings stay intact and locations match the file.
+    """
+    with file.open("rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                body = str(m, "utf-8")
+        except ValueError:
+            # Empty files can't be mapped.
+            body = ""
+    return Source(body, str(file))
+
+
+# Sdl files included by several schemas built in this process, e.g. by `batch`, and their documents.
+_shared_files: Set[Path] = set()
+_shared_documents: Dict[Tuple[Path, bool], DocumentNode] = {}
+
+
+def share_documents(files: Iterable[Path]):
+    """Parse `files` only once for all the schemas including them, by resolved path."""
+    _shared_files.update(file.resolve() for file in files)
+
+
+def parse_from_file(file: Path, no_location: bool = False) -> Optional[DocumentNode]:
     if file.name.startswith("_"):
-        return ""
-    type_defs = []
-    with file.open("r") as f:
+        return None
+    if _shared_files:
+        key = (file.resolve(), no_location)
+        if key[0] in _shared_files:
+            if key not in _shared_documents:
+                _shared_documents[key] = parse(read_source(file), no_location=no_location)
+            return _shared_documents[key]
+    return parse(read_source(file), no_location=no_location)
+
+
+def _parse_in_worker(file: Path) -> Union[DocumentNode, Path, None]:
+    # Graphql errors can't be unpickled, the parent parses failing files again to raise them.
+    try:
+        return parse_from_file(file, no_location=True)
+    except GraphQLError:
+        return file
+
 
-        for line in f.readlines():
-            line = line.lstrip()
-            if line.startswith("#"):
-                continue
-            type_defs.append(line)
+def parallel_parse(files: List[Path], jobs: int = 1) -> bool:
+    """Whether `parse_files` parses `files` in worker processes, without locations."""
+    return jobs > 1 and len(files) > 1
 
-        type_defs = "".join(type_defs)
-        parse(type_defs)
-        return type_defs
+
+def parse_files(files: List[Path], no_location: bool = False, jobs: int = 1) -> List[DocumentNode]:
+    """
+    Parse `files` in a pool of `jobs` processes, results keep the order of `files`.
+
+    Worker results are parsed without locations, unpickling them is otherwise slower than
+    parsing again. Files failing in a worker are parsed again here, so syntax errors still
+    point at the file and line.
+    """
+    if not parallel_parse(files, jobs):
+        documents = [parse_from_file(file, no_location) for file in files]
+    else:
+        chunksize = max(1, len(files) // (jobs * 4))
+        with ProcessPoolExecutor(jobs) as executor:
+            documents = list(executor.map(_parse_in_worker, files, chunksize=chunksize))
+        documents = [parse_from_file(d) if isinstance(d, Path) else d for d in documents]
+    return [document for document in documents if document]
 
 
 base_type_defs = """
@@ -131,6 +201,17 @@ type Mutation
 """
 
 
+def schema_files(path: Union[str, Path]) -> List[Path]:
+    p = Path(path)
+    if p.is_file():
+        return [p]
+    elif p.is_dir():
+        # Sorted, so definitions merge in the same order on every run.
+        return sorted(p.glob("**/*.graphql"))
+    else:
+        raise RuntimeError("path: expect a file or directory!")
+
+
 def make_schema_from_path(
     path: str,
     assume_valid: bool = False,
@@ -139,21 +220,38 @@ def make_schema_from_path(
     experimental_fragment_variables: bool = False,
     federation: bool = False,
     directives: Dict[str, Type[SchemaDirectiveVisitor]] = None,
+    cache: Optional[SchemaCache] = None,
+    jobs: int = 1,
 ):
     p = Path(path)
-    if p.is_file():
-        type_defs = parse_from_file(p)
-    elif p.is_dir():
-        type_defs = [base_type_defs]
-        for file in p.glob("**/*.graphql"):
-            type_def = parse_from_file(file)
-            if type_def:
-                type_defs.append(type_def)
-    else:
-        raise RuntimeError("path: expect a file or directory!")
+    files = schema_files(p)
+
+    # Federation and directive visitors attach resolvers which can't be pickled.
+    if federation or directives:
+        cache = None
+    if cache is not None:
+        # Schemas parsed in workers have no locations, they mustn't be served to serial builds.
+        key = cache.key(
+            files,
+            p.is_dir(),
+            assume_valid,
+            assume_valid_sdl,
+            no_location or parallel_parse(files, jobs),
+            experimental_fragment_variables,
+        )
+        cache.save()
+        schema = cache.get("schema", key)
+        if schema is not None:
+            return schema
+        if cache.get("unpicklable", key):
+            # Failed before, don't pay for pickling again.
+            cache = None
 
-    return make_schema(
-        type_defs,
+    documents = [parse(base_type_defs, no_location=no_location)] if p.is_dir() else []
+    documents.extend(parse_files(files, no_location, jobs))
+
+    schema = make_schema(
+        merge_documents(documents),
         assume_valid,
         assume_valid_sdl,
         no_location,
@@ -161,3 +259,6 @@ def make_schema_from_path(
         federation,
         directives,
     )
+    if cache is not None and not cache.set("schema", key, schema):
+        cache.set("unpicklable", key, True)
+    return schema
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from graphql import GraphQLSchema, get_named_type, is_leaf_type, strip_ignored_characters
+
+from .output import atomic_write
+from .pool import map_schema_chunks
+from .print import FragmentQueryPrinter, build_client, root_types
+
+# Operation type and root field name.
+Operation = Tuple[str, str]
+
+
+class OperationPrinter:
+    """Client operations of root fields, as trees of fields or with fragments shared by all of them."""
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: bool = False,
+        max_depth: Optional[int] = None,
+        max_fields: Optional[int] = None,
+    ):
+        self.schema = schema
+        self.fragments = fragments
+        self.max_depth = max_depth
+        self.max_fields = max_fields
+        self.printer = FragmentQueryPrinter(schema, max_depth, max_fields) if fragments else None
+        self.roots = dict(root_types(schema))
+
+    def __call__(self, operation: Operation) -> Optional[str]:
+        """The document of `operation`, None when no field fits the budgets."""
+        op_type, name = operation
+        field = self.roots[op_type].fields[name]
+        if self.printer:
+            root = get_named_type(field.type)
+            if not is_leaf_type(root) and not self.printer.fragments(root):
+                return None
+            return self.printer.print_operation(field, name, op_type)
+        return build_client(field, name, op_type)
+
+
+def operation_files(schema: GraphQLSchema) -> Dict[str, Operation]:
+    """
+    Document file names of every root field, `{field}.graphql`.
+
+    Fields of the same name in several root types are `{field}.{operation type}.graphql`
+    after the first one.
+    """
+    files: Dict[str, Operation] = {}
+    for op_type, root in root_types(schema):
+        for name in root.fields:
+            file = f"{name}.graphql"
+            if file in files:
+                file = f"{name}.{op_type}.graphql"
+            files[file] = (op_type, name)
+    return files
+
+
+def _print_operations(printer: OperationPrinter, operations: List[Operation]) -> List[Optional[str]]:
+    return [printer(operation) for operation in operations]
+
+
+def print_operations(printer: OperationPrinter, operations: List[Operation], jobs: int = 1) -> List[Optional[str]]:
+    """
+    Print `operations` in a pool of `jobs` processes, in order.
+
+    Every worker has its own printer, so fragments are shared by the operations of its chunks.
+    """
+    jobs = min(jobs, os.cpu_count() or 1)
+    if jobs <= 1 or len(operations) <= 1:
+        return [printer(operation) for operation in operations]
+
+    # Few large chunks, fragments are shared within a worker.
+    size = max(1, len(operations) // jobs)
+    options = (printer.fragments, printer.max_depth, printer.max_fields)
+    return map_schema_chunks(printer.schema, operations, jobs, size, OperationPrinter, options, _print_operations)
+
+
+# Fragments are shared by many documents, they are minified once.
+_minify_definition = lru_cache(maxsize=None)(strip_ignored_characters)
+
+
+def minify(document: str) -> str:
+    """`document` without insignificant whitespace, its definitions are separated by blank lines."""
+    # Definitions end with a brace, so they need no separator once minified.
+    return "".join(_minify_definition(definition) for definition in document.split("\n\n"))
+
+
+def write_manifest(path: Path, documents: List[str]) -> bool:
+    """Write the persisted query manifest of `documents`, their minified texts by hash."""
+    manifest = {}
+    for document in documents:
+        text = minify(document)
+        manifest[hashlib.sha256(text.encode()).hexdigest()] = text
+    return atomic_write(path, lambda out: out.write(json.dumps(manifest, indent=2) + "\n"))
+
+
+def write_operations(
+    directory: Path,
+    printer: OperationPrinter,
+    jobs: int = 1,
+    minified: bool = False,
+    manifest: Optional[Path] = None,
+) -> Tuple[int, int, int]:
+    """
+    Write a document of every root field into `directory`, `minified` or not, and the
+    persisted query `manifest` of them.
+
+    Return the written, unchanged and skipped file counts, root fields are skipped when no
+    field of their type fits the budgets.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    files = operation_files(printer.schema)
+    written = skipped = 0
+    documents = []
+    for file, document in zip(files, print_operations(printer, list(files.values()), jobs)):
+        if document is None:
+            skipped += 1
+            continue
+        documents.append(document)
+        text = minify(document) if minified else document
+        written += atomic_write(directory / file, lambda out: out.write(text + "\n"))
+    if manifest:
+        write_manifest(manifest, documents)
+    return written, len(files) - written - skipped, skipped
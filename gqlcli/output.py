@@ -0,0 +1,263 @@
+import filecmp
+import keyword
+import os
+from collections import defaultdict
+from functools import partial
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from graphql import GraphQLNamedType, get_named_type, is_enum_type, is_leaf_type, is_object_type
+
+from .codegen import Render, module_types, render_type, write_joined, write_module
+from .generator import TypeGenerator, TypeMap, TypeResolverGenerator
+from .utils import to_snake_case
+
+SPLITS = ["none", "type", "file"]
+
+# Module of the whole schema when it isn't split.
+SCHEMA_MODULE = "schema_types"
+TYPE_RESOLVERS_MODULE = "type_resolvers"
+
+
+def atomic_write(path: Path, write: Callable[[IO[str]], None]) -> bool:
+    """
+    Stream `write` into a temporary file and rename it over `path`.
+
+    Return False and leave `path` alone when the content didn't change, so its mtime
+    and the caches of tools watching it stay valid.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w") as f:
+            write(f)
+        if path.is_file() and filecmp.cmp(tmp, path, shallow=False):
+            return False
+        os.replace(tmp, path)
+        return True
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def module_name(name: str, taken: Set[str]) -> str:
+    """Unique python module name for a type or sdl file name."""
+    module = "".join(c if c.isalnum() else "_" for c in to_snake_case(name)) or "_"
+    if module[0].isdigit() or keyword.iskeyword(module):
+        module = f"_{module}"
+    unique, i = module, 1
+    while unique in taken:
+        i += 1
+        unique = f"{module}_{i}"
+    taken.add(unique)
+    return unique
+
+
+def has_locations(types: Iterable[GraphQLNamedType]) -> bool:
+    """Whether the generated `types` know the sdl file they are defined in, which `--split file` needs."""
+    return all(getattr(type_.ast_node and type_.ast_node.loc, "source", None) for type_ in types)
+
+
+def source_name(type_: GraphQLNamedType, root: Optional[Path]) -> str:
+    """The sdl file `type_` is defined in, relative to `root`."""
+    loc = type_.ast_node.loc if type_.ast_node else None
+    source = getattr(loc, "source", None)
+    if not source:
+        # e.g. introspected from a host.
+        return SCHEMA_MODULE
+    file = Path(source.name)
+    try:
+        file = file.resolve().relative_to(root.resolve()) if root and root.is_dir() else Path(file.name)
+    except ValueError:
+        file = Path(file.name)
+    return "_".join(file.with_suffix("").parts)
+
+
+def type_references(type_: GraphQLNamedType) -> Tuple[Set[str], Set[str]]:
+    """
+    Names of the types `type_` refers to, as needed at runtime and in annotations only.
+
+    Interfaces are base classes and enums appear unquoted, other composite types are
+    quoted forward references.
+    """
+    runtime, annotations = set(), set()
+    if is_object_type(type_):
+        runtime.update(i.name for i in type_.interfaces)
+    for field in getattr(type_, "fields", {}).values():
+        args = getattr(field, "args", {})
+        for t in [field.type, *(arg.type for arg in args.values())]:
+            named = get_named_type(t)
+            if is_enum_type(named):
+                runtime.add(named.name)
+            elif not is_leaf_type(named):
+                annotations.add(named.name)
+    runtime.discard(type_.name)
+    annotations.discard(type_.name)
+    return runtime, annotations - runtime
+
+
+def import_lines(modules: Dict[str, List[str]], indent: str = "") -> str:
+    lines = [f"{indent}from .{module} import {', '.join(sorted(names))}\n" for module, names in modules.items()]
+    return "".join(sorted(lines))
+
+
+def rebuild_models(models: List[str]) -> str:
+    """
+    Code resolving the forward references of pydantic `models` once every module is imported.
+
+    Models referring to types which aren't generated, like unions, stay incomplete instead of
+    failing the import, pydantic reports them when they are used.
+    """
+    if not models:
+        return ""
+    return (
+        "\n# Models refer to types of other modules, resolve them now all are imported.\n"
+        f"for _model in [{', '.join(models)}]:\n"
+        "    _model.model_rebuild(raise_errors=False)\n"
+    )
+
+
+class ModuleWriter:
+    """
+    Write generated types into the package `directory`.
+
+    With split `none` everything goes into one module streamed type by type, `type` writes a
+    module per type and `file` a module per sdl source file. Split modules import what they
+    use from each other, type resolvers get their own module and `__init__.py` re-exports
+    everything. Unchanged files aren't rewritten. `fast_import` only applies to split `none`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        kind: str,
+        split: str = "none",
+        render: Optional[Render] = None,
+        root: Optional[Path] = None,
+        fast_import: bool = False,
+    ):
+        self.directory = directory
+        self.kind = kind
+        self.split = split
+        self.render = render or partial(render_type, TypeGenerator(kind))
+        self.root = root
+        self.fast_import = fast_import
+        self.written = 0
+        self.unchanged = 0
+
+    def write_file(self, name: str, write: Callable[[IO[str]], None]):
+        if atomic_write(self.directory / name, write):
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    def modules(self, type_map: TypeMap) -> Dict[str, List[GraphQLNamedType]]:
+        """Generated types of every module, in the order they are written."""
+        taken = {"__init__", TYPE_RESOLVERS_MODULE}
+        names: Dict[str, str] = {}
+        modules: Dict[str, List[GraphQLNamedType]] = defaultdict(list)
+        for types in module_types(type_map.values()):
+            for type_ in types:
+                key = type_.name if self.split == "type" else source_name(type_, self.root)
+                if key not in names:
+                    names[key] = module_name(key, taken)
+                modules[names[key]].append(type_)
+        return modules
+
+    def write(self, type_map: TypeMap, type_resolvers: Optional[TypeResolverGenerator] = None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.split == "none":
+
+            def write(out: IO[str]):
+                write_module(out, type_map, self.kind, self.render, type_resolvers, self.fast_import)
+                out.write("\n")
+
+            self.write_file(f"{SCHEMA_MODULE}.py", write)
+            return
+
+        modules = self.modules(type_map)
+        locations = {type_.name: module for module, types in modules.items() for type_ in types}
+        for module, types in modules.items():
+            self.write_file(f"{module}.py", partial(self.write_types, types=types, locations=locations))
+
+        type_resolvers = type_resolvers or TypeResolverGenerator(type_map)
+        self.write_file(
+            f"{TYPE_RESOLVERS_MODULE}.py",
+            partial(self.write_type_resolvers, type_resolvers=type_resolvers, locations=locations),
+        )
+
+        exports = {module: [type_.name for type_ in types] for module, types in modules.items()}
+        resolvers = [f"resolve_{to_snake_case(name)}_type" for name in type_resolvers.type_resolver_map]
+        if resolvers:
+            exports[TYPE_RESOLVERS_MODULE] = resolvers
+        models = self.cross_module_models(modules, locations)
+        self.write_file("__init__.py", lambda out: out.write(import_lines(exports) + rebuild_models(models)))
+
+    def cross_module_models(self, modules: Dict[str, List[GraphQLNamedType]], locations: Dict[str, str]) -> List[str]:
+        """Pydantic models annotated with types of other modules, which they only import for type checking."""
+        if self.kind != "pydantic":
+            return []
+        models = []
+        for module, types in modules.items():
+            for type_ in types:
+                _, quoted = type_references(type_)
+                if any(locations.get(name, module) != module for name in quoted):
+                    models.append(type_.name)
+        return sorted(models)
+
+    def write_types(self, out: IO[str], types: List[GraphQLNamedType], locations: Dict[str, str]):
+        rendered = [self.render(type_) for type_ in types]
+        text = "".join(rendered)
+        enums = any(is_enum_type(type_) for type_ in types)
+
+        runtime: Dict[str, List[str]] = defaultdict(list)
+        annotations: Dict[str, List[str]] = defaultdict(list)
+        module = locations[types[0].name]
+        for type_ in types:
+            needed, quoted = type_references(type_)
+            for names, imports in [(needed, runtime), (quoted, annotations)]:
+                for name in sorted(names):
+                    if locations.get(name, module) != module and name not in imports[locations[name]]:
+                        imports[locations[name]].append(name)
+        # Names imported for runtime are available to annotations too.
+        annotations = {
+            m: [name for name in names if name not in runtime.get(m, ())] for m, names in annotations.items()
+        }
+        annotations = {m: names for m, names in annotations.items() if names}
+
+        typing = [name for name in ["List", "Optional"] if f"{name}[" in text]
+        if "(NamedTuple)" in text:
+            typing.insert(1 if "List" in typing else 0, "NamedTuple")
+        if annotations:
+            typing.insert(0, "TYPE_CHECKING")
+
+        stdlib, third_party = "", ""
+        if "@dataclass" in text:
+            stdlib += "from dataclasses import dataclass\n"
+        if enums:
+            stdlib += "from enum import Enum\n"
+            third_party += "from gql import enum_type\n"
+        if typing:
+            stdlib += f"from typing import {', '.join(typing)}\n"
+        if "(Struct" in text:
+            third_party += "from msgspec import Struct\n"
+        if "(BaseModel)" in text:
+            third_party += "from pydantic import BaseModel\n"
+        sections = [stdlib, third_party, import_lines(runtime)]
+        if annotations:
+            sections.append("if TYPE_CHECKING:  # pragma: no cover\n" + import_lines(annotations, indent="    "))
+        imports = "\n".join(section for section in sections if section)
+
+        if imports:
+            # Two blank lines before the first class, dataclasses start with their decorator.
+            out.write(imports + ("\n" if rendered[0].startswith("\n") else "\n\n"))
+        write_joined(out, rendered)
+
+    def write_type_resolvers(self, out: IO[str], type_resolvers: TypeResolverGenerator, locations: Dict[str, str]):
+        imports = defaultdict(list)
+        for names in type_resolvers.type_resolver_map.values():
+            for name in names:
+                if name in locations and name not in imports[locations[name]]:
+                    imports[locations[name]].append(name)
+
+        out.write("from gql import type_resolver\n\n")
+        out.write(import_lines(imports) + "\n" if imports else "")
+        write_joined(out, type_resolvers.all_type_resolvers())
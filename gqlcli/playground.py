@@ -615,7 +615,7 @@ class PlaygroundServer:
         response_data = json.dumps(
             {
                 'data': result.data,
-                'errors': [error.formatted() for error in (result.errors or [])],
+                'errors': [error.formatted for error in (result.errors or [])],
             }
         )
         start_response(
@@ -0,0 +1,48 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Any, Callable, List, Sequence, Union
+
+from graphql import GraphQLSchema, build_schema, print_schema
+
+# The worker state of this process, built once from the schema.
+_worker: Any = None
+
+
+def _init_worker(schema: Union[GraphQLSchema, str], make_worker: Callable[..., Any], args: tuple):
+    global _worker
+    if isinstance(schema, str):
+        schema = build_schema(schema, assume_valid=True, assume_valid_sdl=True, no_location=True)
+    _worker = make_worker(schema, *args)
+
+
+def _run_chunk(work: Callable[[Any, list], list], chunk: list) -> list:
+    return work(_worker, chunk)
+
+
+def map_schema_chunks(
+    schema: GraphQLSchema,
+    items: Sequence,
+    jobs: int,
+    size: int,
+    make_worker: Callable[..., Any],
+    args: tuple,
+    work: Callable[[Any, list], list],
+) -> List:
+    """
+    Run `work(worker, chunk)` on chunks of `size` items in a pool of `jobs` processes, where
+    every process builds its `worker` once with `make_worker(schema, *args)`.
+
+    Forked workers inherit the schema, elsewhere they rebuild it from its printed SDL, as
+    schemas can be too deep to pickle, and `make_worker`, `args` and `work` are pickled.
+    Results are concatenated in the order of `items`.
+    """
+    chunks = [list(items[i : i + size]) for i in range(0, len(items), size)]
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Process arguments aren't pickled when forking.
+        context, initargs = multiprocessing.get_context("fork"), (schema, make_worker, args)
+    else:
+        context, initargs = multiprocessing.get_context(), (print_schema(schema), make_worker, args)
+    with ProcessPoolExecutor(jobs, context, _init_worker, initargs) as executor:
+        return list(chain.from_iterable(executor.map(partial(_run_chunk, work), chunks)))
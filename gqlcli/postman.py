@@ -0,0 +1,29 @@
+import json
+from typing import IO, List
+
+from graphql import GraphQLSchema
+
+from .fake import fake_variable
+from .print import build_client, root_types
+from .utils import make_headers, make_postman_request
+
+COLLECTION_SCHEMA = "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+
+
+def write_collection(out: IO[str], schema: GraphQLSchema, name: str, headers: List[str]):
+    """
+    Stream a postman collection of every root field of `schema` into `out`.
+
+    Requests are grouped in a folder per operation type, and written one by one as they are
+    built, so memory doesn't grow with the number of fields.
+    """
+    header = make_headers(headers)
+    out.write('{\n"info": ' + json.dumps({"name": name, "schema": COLLECTION_SCHEMA}) + ',\n"item": [')
+    for i, (op_type, root) in enumerate(root_types(schema)):
+        out.write(("," if i else "") + "\n{" + f'"name": {json.dumps(op_type)}, "item": [')
+        for j, (field_name, field) in enumerate(root.fields.items()):
+            query = build_client(field, field_name, op_type)
+            request = make_postman_request(field_name, query, header, fake_variable(field))
+            out.write(("," if j else "") + "\n" + json.dumps(request, ensure_ascii=False))
+        out.write("\n]}")
+    out.write("\n]\n}\n")
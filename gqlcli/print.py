@@ -1,6 +1,19 @@
-from typing import List, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
 
-from graphql import GraphQLObjectType, GraphQLOutputType, is_object_type, is_scalar_type
+from graphql import (
+    GraphQLField,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    GraphQLSchema,
+    get_named_type,
+    is_abstract_type,
+    is_leaf_type,
+    is_object_type,
+    is_required_argument,
+    is_scalar_type,
+)
 
 
 def print_args(args) -> Tuple[list, list]:
@@ -57,13 +70,186 @@ def build_client(query, op, op_type):
     return op_type + " " + operation_name + print_block([fields])
 
 
+def root_types(schema: GraphQLSchema) -> List[Tuple[str, GraphQLObjectType]]:
+    """Operation types of `schema` and their root types."""
+    roots = [
+        ("query", schema.query_type),
+        ("mutation", schema.mutation_type),
+        ("subscription", schema.subscription_type),
+    ]
+    return [(op_type, root) for op_type, root in roots if root]
+
+
+def root_field(schema: GraphQLSchema, op: str) -> Tuple[Optional[GraphQLField], str]:
+    """The query, or else mutation or subscription, field `op` and its operation type."""
+    for op_type, root in root_types(schema):
+        if op in root.fields:
+            return root.fields[op], op_type
+    return None, "query"
+
+
 def print_query(schema, op: str):
-    query = schema.query_type.fields.get(op)
-    op_type = "query"
+    query, op_type = root_field(schema, op)
     if not query:
-        query = schema.mutation_type.fields.get(op)
-        op_type = "mutation"
+        return f"No {op} query."
+
+    return build_client(query, op, op_type)
+
+
+# A selection of a fragment: a field, aliased or not, and the type whose fragment it spreads or None for
+# leaf fields. With an empty field, it's an inline fragment on the type.
+Selection = Tuple[str, Optional[str]]
+
+
+class FragmentQueryPrinter:
+    """
+    Client queries selecting every composite type through one named fragment.
+
+    Types are visited breadth first from the root field, each one gets its fragment once,
+    at its shortest distance from the root. Fragments only spread the fragments of deeper
+    types, so they never form cycles, and no field is nested deeper than `max_depth`.
+    `max_fields` bounds the fields of all fragments, leaf fields are picked first.
+    Interfaces and unions select their possible types with inline fragments, fields of the
+    same name but of different types across them are aliased as `{field}{Type}`. Fields with
+    required arguments are left out. Printed fragments are shared by the queries of a printer.
+    """
+
+    def __init__(self, schema: GraphQLSchema, max_depth: Optional[int] = None, max_fields: Optional[int] = None):
+        self.schema = schema
+        self.max_depth = max_depth
+        self.max_fields = max_fields
+        self.aliased = self.conflicting_fields(schema)
+        # Fragments used by the queries on a root type, and the text of every printed fragment.
+        self.root_fragments: Dict[str, List[str]] = {}
+        self.printed: Dict[Tuple[str, Tuple[Selection, ...]], str] = {}
+        self.selectable: Dict[str, List[Selection]] = {}
+
+    @staticmethod
+    def conflicting_fields(schema: GraphQLSchema) -> Set[Tuple[str, str]]:
+        """(type, field) names of fields whose type differs from a same named field of another possible type."""
+        conflicts = set()
+        for abstract in schema.type_map.values():
+            if not is_abstract_type(abstract):
+                continue
+            types: Dict[str, Dict[str, str]] = {}
+            for type_ in [abstract, *schema.get_possible_types(abstract)]:
+                for name, field in getattr(type_, "fields", {}).items():
+                    types.setdefault(name, {})[type_.name] = str(field.type)
+            for name, field_types in types.items():
+                if len(set(field_types.values())) > 1:
+                    conflicts.update((type_name, name) for type_name in field_types)
+        return conflicts
+
+    def type_selections(self, type_name: str) -> List[Selection]:
+        """Every field `type_name` can select without arguments, with the type each composite field spreads."""
+        if type_name not in self.selectable:
+            type_ = self.schema.type_map[type_name]
+            items: List[Selection] = [("__typename", None)] if is_abstract_type(type_) else []
+            for name, field in getattr(type_, "fields", {}).items():
+                if any(is_required_argument(arg) for arg in field.args.values()):
+                    continue
+                target = get_named_type(field.type)
+                if (type_name, name) in self.aliased:
+                    name = f"{name}{type_name}: {name}"
+                items.append((name, None if is_leaf_type(target) else target.name))
+            self.selectable[type_name] = items
+        return self.selectable[type_name]
+
+    def fragment_selections(self, root: GraphQLNamedType) -> Dict[str, List[Selection]]:
+        """Selections of the fragments of `root` and the types it reaches, in breadth first order."""
+        levels = {root.name: 1}
+        queue = deque([root.name])
+        budget = self.max_fields
+        selections: Dict[str, List[Selection]] = {}
+        while queue:
+            type_name = queue.popleft()
+            level = levels[type_name]
+
+            def deeper(target: str) -> bool:
+                if target not in levels:
+                    if self.max_depth is not None and level >= self.max_depth:
+                        return False
+                    levels[target] = level + 1
+                    queue.append(target)
+                return levels[target] > level
+
+            candidates = self.type_selections(type_name)
+            if budget is not None:
+                # Leaf fields first, in schema order.
+                leaves = [item for item in candidates if item[1] is None][:budget]
+                composites = [item for item in candidates if item[1] is not None][: budget - len(leaves)]
+                budget -= len(leaves) + len(composites)
+                chosen = set(leaves + composites)
+                candidates = [item for item in candidates if item in chosen]
+
+            items = [(name, target) for name, target in candidates if target is None or deeper(target)]
+            type_ = self.schema.type_map[type_name]
+            if is_abstract_type(type_):
+                items.extend(("", t.name) for t in self.schema.get_possible_types(type_) if deeper(t.name))
+            selections[type_name] = items
+
+        # Deepest first, drop spreads of fragments left empty by the budgets.
+        for name in reversed(list(selections)):
+            selections[name] = [(f, t) for f, t in selections[name] if t is None or selections[t]]
+        return selections
+
+    @staticmethod
+    def fragment_name(type_name: str) -> str:
+        return f"{type_name}Fields"
+
+    def print_fragment(self, type_name: str, items: List[Selection]) -> str:
+        key = (type_name, tuple(items))
+        if key not in self.printed:
+            self.printed[key] = self._print_fragment(type_name, items)
+        return self.printed[key]
+
+    def _print_fragment(self, type_name: str, items: List[Selection]) -> str:
+        lines = []
+        for name, target in items:
+            if target is None:
+                lines.append(f"  {name}")
+            else:
+                head = name or f"... on {target}"
+                lines.append(f"  {head}" + print_block([f"    ...{self.fragment_name(target)}"], 2))
+        return f"fragment {self.fragment_name(type_name)} on {type_name}" + print_block(lines)
+
+    def fragments(self, root: GraphQLNamedType) -> List[str]:
+        """Printed fragments of the queries on `root`, the first one is the fragment of `root`."""
+        if root.name in self.root_fragments:
+            return self.root_fragments[root.name]
+        selections = self.fragment_selections(root)
+        fragments = []
+        if selections[root.name]:
+            # Only the fragments still spread after pruning.
+            used, todo = {root.name: None}, [root.name]
+            while todo:
+                for _, target in selections[todo.pop()]:
+                    if target is not None and target not in used:
+                        used[target] = None
+                        todo.append(target)
+            fragments = [self.print_fragment(name, items) for name, items in selections.items() if name in used]
+        self.root_fragments[root.name] = fragments
+        return fragments
+
+    def print_query(self, op: str) -> str:
+        query, op_type = root_field(self.schema, op)
         if not query:
             return f"No {op} query."
+        return self.print_operation(query, op, op_type)
 
-    return build_client(query, op, op_type)
+    def print_operation(self, query: GraphQLField, op: str, op_type: str) -> str:
+        operation_name, selection = op, op
+        if query.args:
+            var_defs, vars = print_args(query.args)
+            operation_name += f'({", ".join(var_defs)})'
+            selection += f'({", ".join(vars)})'
+
+        root = get_named_type(query.type)
+        if is_leaf_type(root):
+            return op_type + " " + operation_name + print_block(["  " + selection])
+
+        fragments = self.fragments(root)
+        if not fragments:
+            return f"No field of {op} fits the budgets."
+        spread = "  " + selection + print_block([f"    ...{self.fragment_name(root.name)}"], 2)
+        return "\n\n".join([op_type + " " + operation_name + print_block([spread]), *fragments])
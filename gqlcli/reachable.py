@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from graphql import (
+    GraphQLSchema,
+    get_named_type,
+    is_input_object_type,
+    is_interface_type,
+    is_object_type,
+    is_union_type,
+)
+
+from .generator import TypeMap
+
+
+class TypeGraph:
+    """
+    Adjacency index of a schema, the names of the types every named type refers to.
+
+    Object and interface types refer to their interfaces and the types of their fields and
+    arguments, interfaces and unions to their possible types, inputs to their field types.
+    """
+
+    def __init__(self, schema: GraphQLSchema):
+        self.schema = schema
+        self.edges: Dict[str, Tuple[str, ...]] = {}
+        for name, type_ in schema.type_map.items():
+            refs: Dict[str, None] = {}
+            if is_object_type(type_) or is_interface_type(type_):
+                refs.update((i.name, None) for i in type_.interfaces)
+            if is_object_type(type_) or is_interface_type(type_) or is_input_object_type(type_):
+                for field in type_.fields.values():
+                    refs[get_named_type(field.type).name] = None
+                    for arg in getattr(field, "args", {}).values():
+                        refs[get_named_type(arg.type).name] = None
+            if is_interface_type(type_) or is_union_type(type_):
+                refs.update((t.name, None) for t in schema.get_possible_types(type_))
+            refs.pop(name, None)
+            self.edges[name] = tuple(refs)
+
+    def root_types(self, fields: Iterable[str]) -> List[str]:
+        """
+        Types of the root `fields`, given as `Query.user` or `Query` for all its fields.
+
+        Raise ValueError for unknown root types or fields.
+        """
+        schema = self.schema
+        roots = {t.name: t for t in [schema.query_type, schema.mutation_type, schema.subscription_type] if t}
+        names: Dict[str, None] = {}
+        for spec in fields:
+            type_name, _, field_name = spec.strip().partition(".")
+            root = roots.get(type_name)
+            if root is None:
+                raise ValueError(f"{type_name} is not a root type of the schema")
+            if field_name and field_name not in root.fields:
+                raise ValueError(f"{type_name} has no {field_name} field")
+            for name in [field_name] if field_name else root.fields:
+                field = root.fields[name]
+                names[get_named_type(field.type).name] = None
+                names.update((get_named_type(arg.type).name, None) for arg in field.args.values())
+        return list(names)
+
+    def operation_root_types(self) -> List[str]:
+        """Types referenced by any operation."""
+        roots = [self.schema.query_type, self.schema.mutation_type, self.schema.subscription_type]
+        return self.root_types(root.name for root in roots if root)
+
+    def reachable(self, names: Iterable[str]) -> Set[str]:
+        """Names of `names` and every type transitively referenced by them."""
+        seen = set(names)
+        todo = list(seen)
+        while todo:
+            for ref in self.edges.get(todo.pop(), ()):
+                if ref not in seen:
+                    seen.add(ref)
+                    todo.append(ref)
+        return seen
+
+    def prune(self, names: Iterable[str]) -> TypeMap:
+        """Type map of the types reachable from `names`, in schema order."""
+        reachable = self.reachable(names)
+        return {name: type_ for name, type_ in self.schema.type_map.items() if name in reachable}
@@ -57,7 +57,8 @@ Callback = Callable[..., Any]
 
 
 def each(list_or_dict: IndexedObject, callback: Callback):
-    if isinstance(list_or_dict, list):
+    # graphql-core 3.2 keeps schema directives in a tuple.
+    if isinstance(list_or_dict, (list, tuple)):
         for value in list_or_dict:
             callback(value)
     else:
@@ -0,0 +1,164 @@
+import random
+from pathlib import Path
+from typing import List
+
+from .make_schema import base_type_defs
+
+SCALARS = ["String", "Int", "Float", "Boolean", "ID"]
+
+directive_type_defs = """
+directive @upper on FIELD_DEFINITION
+"""
+
+# Declared by federation_service_type_defs when building a federation schema.
+key_directive_type_defs = """
+directive @key(fields: String) on OBJECT | INTERFACE
+"""
+
+
+class SchemaSynthesizer:
+    """
+    Generate a realistic random schema for benchmarks.
+
+    About a tenth of the types are enums, a tenth interfaces, a twentieth unions and a
+    sixth inputs, the rest are object types. Objects implement interfaces, fields have
+    arguments, lists, non null wrappers and directives. Same arguments and seed give the
+    same schema. With `federation`, objects are entities and `@key` is left undeclared.
+    """
+
+    def __init__(self, types: int = 100, fields: int = 10, seed: int = 0, federation: bool = False):
+        self.fields = fields
+        self.federation = federation
+        self.random = random.Random(seed)
+
+        types = max(types, 10)
+        self.enums = [f"Enum{i}" for i in range(max(1, types // 10))]
+        self.interfaces = [f"Interface{i}" for i in range(max(1, types // 10))]
+        self.unions = [f"Union{i}" for i in range(max(1, types // 20))]
+        self.inputs = [f"Input{i}" for i in range(max(1, types // 6))]
+        count = types - len(self.enums) - len(self.interfaces) - len(self.unions) - len(self.inputs)
+        self.objects = [f"Object{i}" for i in range(max(1, count))]
+
+    def wrap(self, name: str) -> str:
+        roll = self.random.random()
+        if roll < 0.15:
+            name = f"[{name}!]"
+        elif roll < 0.25:
+            name = f"[{name}]"
+        if self.random.random() < 0.3:
+            name += "!"
+        return name
+
+    def output_type(self) -> str:
+        roll = self.random.random()
+        if roll < 0.5:
+            return self.wrap(self.random.choice(SCALARS))
+        elif roll < 0.6:
+            return self.wrap(self.random.choice(self.enums))
+        elif roll < 0.9:
+            return self.wrap(self.random.choice(self.objects))
+        elif roll < 0.95:
+            return self.wrap(self.random.choice(self.interfaces))
+        return self.wrap(self.random.choice(self.unions))
+
+    def input_type(self, inputs: List[str]) -> str:
+        roll = self.random.random()
+        if roll < 0.7 or not inputs:
+            return self.wrap(self.random.choice(SCALARS))
+        elif roll < 0.85:
+            return self.wrap(self.random.choice(self.enums))
+        return self.wrap(self.random.choice(inputs))
+
+    def arguments(self) -> str:
+        if self.random.random() > 0.3:
+            return ""
+        args = [f"arg{i}: {self.input_type(self.inputs)}" for i in range(self.random.randint(1, 3))]
+        return f"({', '.join(args)})"
+
+    def interface_fields(self, name: str) -> List[str]:
+        return ["id: ID!", f"{name[0].lower()}{name[1:]}Name: String"]
+
+    def enum(self, name: str) -> str:
+        values = "\n".join(f"  VALUE_{i}" for i in range(self.random.randint(2, 8)))
+        return f"enum {name} {{\n{values}\n}}\n"
+
+    def interface(self, name: str) -> str:
+        fields = "\n".join(f"  {f}" for f in self.interface_fields(name))
+        return f'"""Interface {name}."""\ninterface {name} @key(fields: "id") {{\n{fields}\n}}\n'
+
+    def object(self, name: str) -> str:
+        interfaces = self.random.sample(self.interfaces, k=min(len(self.interfaces), self.random.randint(0, 2)))
+        fields = [f for i in interfaces for f in self.interface_fields(i)]
+        for i in range(self.fields):
+            directive = " @upper" if self.random.random() < 0.05 else ""
+            fields.append(f"field{i}{self.arguments()}: {self.output_type()}{directive}")
+
+        header = f"type {name}"
+        if interfaces:
+            header += f" implements {' & '.join(interfaces)}"
+        if self.federation:
+            header += ' @key(fields: "id")'
+            fields.insert(0, "id: ID!")
+        body = "\n".join(f"  {f}" for f in dict.fromkeys(fields))
+        return f'"""Object {name}."""\n{header} {{\n{body}\n}}\n'
+
+    def union(self, name: str) -> str:
+        members = self.random.sample(self.objects, k=min(len(self.objects), self.random.randint(2, 5)))
+        return f"union {name} = {' | '.join(members)}\n"
+
+    def input(self, name: str) -> str:
+        # Only refer to earlier inputs, fake_variable can't fill recursive inputs.
+        earlier = self.inputs[: self.inputs.index(name)]
+        fields = "\n".join(f"  field{i}: {self.input_type(earlier)}" for i in range(max(2, self.fields // 2)))
+        return f"input {name} {{\n{fields}\n}}\n"
+
+    def root_types(self) -> List[str]:
+        queries, mutations = [], []
+        for i, name in enumerate(self.objects):
+            lower = f"{name[0].lower()}{name[1:]}"
+            queries.append(f"  {lower}(id: ID!): {name}")
+            if i % 3 == 0:
+                queries.append(f"  {lower}List(first: Int, after: String, order: {self.enums[0]}): [{name}!]!")
+        for i, name in enumerate(self.inputs):
+            mutations.append(f"  mutation{i}(input: {name}!): {self.objects[i % len(self.objects)]}")
+        # Directories get `type Query` and `type Mutation` from base_type_defs.
+        return [
+            "extend type Query {\n" + "\n".join(queries) + "\n}\n",
+            "extend type Mutation {\n" + "\n".join(mutations) + "\n}\n",
+        ]
+
+    def definitions(self) -> List[str]:
+        definitions = [directive_type_defs]
+        if not self.federation:
+            definitions.append(key_directive_type_defs)
+        definitions.extend(self.enum(name) for name in self.enums)
+        definitions.extend(self.interface(name) for name in self.interfaces)
+        definitions.extend(self.object(name) for name in self.objects)
+        definitions.extend(self.union(name) for name in self.unions)
+        definitions.extend(self.input(name) for name in self.inputs)
+        definitions.extend(self.root_types())
+        return definitions
+
+
+def synth_schema(types: int = 100, fields: int = 10, seed: int = 0, federation: bool = False) -> str:
+    definitions = SchemaSynthesizer(types, fields, seed, federation).definitions()
+    return "\n".join([base_type_defs + "\n", *definitions])
+
+
+def write_synth_schema(
+    directory: Path,
+    types: int = 100,
+    fields: int = 10,
+    files: int = 1,
+    seed: int = 0,
+    federation: bool = False,
+):
+    """Write a synthetic schema split into `files` sdl files under `directory`."""
+    definitions = SchemaSynthesizer(types, fields, seed, federation).definitions()
+    files = max(1, min(files, len(definitions)))
+    size = -(-len(definitions) // files)
+    directory.mkdir(parents=True, exist_ok=True)
+    for n in range(files):
+        chunk = definitions[n * size : (n + 1) * size]
+        if chunk:
+            (directory / f"schema{n:05}.graphql").write_text("\n".join(chunk))
@@ -1,25 +1,42 @@
 import re
+import sys
+from functools import lru_cache
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, windows
+    resource = None
 
 
 # From this response in Stackoverflow
 # http://stackoverflow.com/a/1176023/1072990
+@lru_cache(maxsize=65536)
 def to_snake_case(name):
     s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
     return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
 
 
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, 0 if unknown."""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
 def make_headers(headers: list):
     return [
         {
-            "key": header.split(":", 1)[0],
-            "value": header.split(":", 1)[1],
+            "key": header.split(":", 1)[0].strip(),
+            "value": header.split(":", 1)[1].strip(),
             "type": "text",
         }
         for header in headers
     ]
 
 
-def make_postman_request(name, query, headers):
+def make_postman_request(name, query, headers, variables: str = ""):
     return {
         "name": name,
         "request": {
@@ -27,7 +44,7 @@ def make_postman_request(name, query, headers):
             "header": headers,
             "body": {
                 "mode": "graphql",
-                "graphql": {"query": query, "variables": ""},
+                "graphql": {"query": query, "variables": variables},
                 "options": {"graphql": {}},
             },
             "url": {
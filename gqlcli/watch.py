@@ -0,0 +1,119 @@
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from graphql import DocumentNode, GraphQLError, GraphQLNamedType, GraphQLSchema, is_leaf_type, parse, print_ast
+
+from .codegen import Render
+from .generator import TypeMap
+from .make_schema import base_type_defs, make_schema, merge_documents, parse_from_file, schema_files
+
+
+class SchemaWatcher:
+    """
+    Poll a schema file or directory and rebuild the schema when it changes.
+
+    Parsed documents are kept per file, only added or modified files are parsed again.
+    """
+
+    def __init__(self, path: Path, interval: float = 0.5):
+        self.path = path
+        self.interval = interval
+        self.documents: Dict[Path, Tuple[int, int, Optional[DocumentNode]]] = {}
+        self.errors: Set[Path] = set()
+
+    def poll(self) -> bool:
+        """
+        Parse changed files, return whether anything changed.
+
+        Files removed while they are polled, like the old file of an atomic save, are
+        left out, and parsed again if they are back on the next poll.
+        """
+        try:
+            files = schema_files(self.path)
+        except RuntimeError:
+            # The schema file is being replaced, look again on the next poll.
+            return False
+        changed = False
+        documents = {}
+        for file in files:
+            try:
+                stat = file.stat()
+                entry = self.documents.get(file)
+                if not entry or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+                    try:
+                        document = parse_from_file(file)
+                    except GraphQLError as e:
+                        print(e)
+                        self.errors.add(file)
+                        document = None
+                    else:
+                        self.errors.discard(file)
+                    entry = (stat.st_mtime_ns, stat.st_size, document)
+                    changed = True
+            except FileNotFoundError:
+                if file == self.path:
+                    return False
+                continue
+            documents[file] = entry
+        changed = changed or set(self.documents) != set(documents)
+        self.errors.intersection_update(documents)
+        self.documents = documents
+        return changed
+
+    def build(self) -> GraphQLSchema:
+        documents = [parse(base_type_defs)] if self.path.is_dir() else []
+        documents.extend(document for _, _, document in self.documents.values() if document)
+        return make_schema(merge_documents(documents), assume_valid=True)
+
+    def __iter__(self) -> Iterator[GraphQLSchema]:
+        """Yield the schema now and after every change, files with syntax errors hold the rebuild back."""
+        while True:
+            if self.poll() and not self.errors:
+                yield self.build()
+            time.sleep(self.interval)
+
+
+def same_definition(a: tuple, b: tuple) -> bool:
+    if len(a) != len(b):
+        return False
+    if all(x is y for x, y in zip(a, b)):
+        return True
+    # The file was parsed again, compare the printed definitions.
+    return [print_ast(x) for x in a if x] == [print_ast(y) for y in b if y]
+
+
+class RenderCache:
+    """
+    Reuse rendered types while their definitions are unchanged.
+
+    Unchanged files keep their parsed documents, so most types have the very same AST
+    nodes after a rebuild, other types of a modified file are compared by printed SDL.
+    """
+
+    def __init__(self, render: Render):
+        self.render = render
+        self.entries: Dict[str, Tuple[tuple, bool, str]] = {}
+        self.rendered = 0
+
+    def prune(self, type_map: TypeMap):
+        """Drop removed types, and everything if a type switched between leaf and composite."""
+        for name in list(self.entries):
+            type_ = type_map.get(name)
+            if type_ is None:
+                del self.entries[name]
+            elif is_leaf_type(type_) != self.entries[name][1]:
+                # Referencing types quote composite type names only.
+                self.entries.clear()
+                return
+
+    def __call__(self, type_: GraphQLNamedType) -> str:
+        nodes = (type_.ast_node, *(type_.extension_ast_nodes or ()))
+        entry = self.entries.get(type_.name)
+        if entry and same_definition(entry[0], nodes):
+            rendered = entry[2]
+        else:
+            rendered = self.render(type_)
+            self.rendered += 1
+        self.entries[type_.name] = (nodes, is_leaf_type(type_), rendered)
+        return rendered
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+from graphql import build_schema, parse
+
+from gqlcli.cost import Cost, CostEstimator
+from gqlcli.print import FragmentQueryPrinter
+
+SDL = """
+directive @cost(weight: String!) on FIELD_DEFINITION | OBJECT
+directive @listSize(assumedSize: Int, slicingArguments: [String!]) on FIELD_DEFINITION
+
+type Query {
+  users(first: Int, last: Int): [User!]! @listSize(slicingArguments: ["first", "last"])
+  top: [User] @listSize(assumedSize: 3)
+  search: [[User]]
+}
+
+type User @cost(weight: "2") {
+  id: ID
+  friends: [User] @cost(weight: "5")
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def estimator():
+    return CostEstimator(build_schema(SDL))
+
+
+@pytest.mark.parametrize(
+    "query, cost",
+    [
+        # The largest slicing argument, times the friends of every user.
+        ("query a($n: Int = 4) { users(first: $n, last: 2) { id friends { id } } }", Cost(3, 4, 252)),
+        ("query b { top { id } }", Cost(2, 2, 9)),
+        # Lists of lists count the list size of every level.
+        ("query c { search { id } }", Cost(2, 2, 300)),
+        ("query d { users(first: 100) { ...U } } fragment U on User { id }", Cost(2, 2, 300)),
+    ],
+)
+def test_annotated_costs(estimator, query, cost):
+    [(_, estimated)] = estimator.estimate(parse(query)).items()
+
+    assert estimated == cost
+
+
+def test_variables_set_slicing_arguments():
+    estimator = CostEstimator(build_schema(SDL), variables={"n": 50})
+
+    assert estimator.estimate(parse("query a($n: Int) { users(first: $n) { id } }"))["a"].size == 150
+
+
+def test_anonymous_operations_are_named_by_position(estimator):
+    assert list(estimator.estimate(parse("{ top { id } } query b { top { id } } { search { id } }"))) == [
+        "operation1",
+        "b",
+        "operation3",
+    ]
+
+
+def test_unknown_fields_are_errors(estimator):
+    with pytest.raises(ValueError):
+        estimator.estimate(parse("{ nope }"))
+
+
+def test_fragment_query_cost():
+    schema = build_schema((Path(__file__).parents[1] / "schema.graphql").read_text())
+    query = FragmentQueryPrinter(schema).print_query("hero")
+
+    assert CostEstimator(schema).estimate(parse(query))["hero"] == Cost(2, 13, 27)
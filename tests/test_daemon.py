@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from gqlcli.daemon import Daemon, connect, socket_path
+from gqlcli.lazy import schema_loader
+
+SDL = "type Query { users: [User] }\ntype User { id: ID }\n"
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    # Daemon.run changes into the directory of the call.
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "schema.graphql"
+    path.write_text(SDL)
+    (tmp_path / "users.graphql").write_text("query users { users { id } }\n")
+    (tmp_path / "empty").mkdir()
+    return Daemon(str(path), schema_loader(None, path, None, 0), path)
+
+
+def run(daemon: Daemon, *args: str):
+    return daemon.run(["-p", daemon.key, *args], str(Path(daemon.key).parent))
+
+
+def test_successful_call_exits_with_0(daemon):
+    stdout, _, code = run(daemon, "cost", "users.graphql")
+
+    assert code == 0
+    assert "users" in stdout
+
+
+@pytest.mark.parametrize("args", [["--max-cost", "1", "users.graphql"], ["empty"]], ids=["over budget", "no documents"])
+def test_failed_call_reports_its_exit_code(daemon, args):
+    stdout, _, code = run(daemon, "cost", *args)
+
+    assert code == 1
+    # The daemon keeps answering.
+    assert run(daemon, "cost", "users.graphql")[2] == 0
+
+
+def test_client_leaves_copying_to_the_caller(daemon, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyclip", None)
+    obj = {}
+    stdout, _, code = daemon.run(["-p", daemon.key, "c", "users"], str(Path(daemon.key).parent), obj)
+
+    assert code == 0
+    assert obj["copy"] + "\n" == stdout
+
+
+def test_connect_without_daemon_creates_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    assert connect("schema.graphql") is None
+    assert not (tmp_path / "gqlcli").exists()
+    assert socket_path("schema.graphql", create=True).parent.stat().st_mode & 0o777 == 0o700
@@ -0,0 +1,45 @@
+import asyncio
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+from gqlcli.generator import LOADER
+
+
+def loader_class():
+    namespace = {}
+    exec(LOADER, namespace)
+
+    class PostsLoader(namespace["Loader"]):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        async def batch_load(self, keys):
+            self.batches.append(keys)
+            return [len(self.batches)] * len(keys)
+
+    return PostsLoader
+
+
+@dataclass
+class Author:
+    name: str
+
+
+def test_loader_batches_unhashable_keys():
+    PostsLoader = loader_class()
+    info = SimpleNamespace(context={})
+    author = Author("a")
+    keys = [
+        (author, {"tags": ["a", "b"], "first": 2}),
+        (author, {"first": 2, "tags": ["a", "b"]}),
+        (Author("a"), {"tags": ["b"]}),
+    ]
+
+    async def load():
+        return await asyncio.gather(*(PostsLoader.get(info).load(key) for key in keys))
+
+    assert asyncio.run(load()) == [1, 1, 1]
+    loader = info.context["loaders"][PostsLoader]
+    # Equal arguments of the same parent are loaded once, other parents are other keys.
+    assert loader.batches == [[keys[0], keys[2]]]
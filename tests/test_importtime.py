@@ -0,0 +1,36 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Milliseconds allowed to import the entry point, best of a few runs.
+BUDGET = 150
+
+# Heavy dependencies are imported inside the commands using them.
+DEFERRED_MODULES = ["graphql", "requests", "pyclip", "prompt_toolkit"]
+
+_r_importtime = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)$")
+
+
+def import_times() -> dict:
+    """Cumulative import time in microseconds of every module imported by gqlcli.main."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import gqlcli.main"],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {m.group(3): int(m.group(2)) for m in map(_r_importtime.match, proc.stderr.splitlines()) if m}
+
+
+def test_entry_point_imports_within_budget():
+    best = min(import_times()["gqlcli.main"] for _ in range(3)) / 1000
+
+    assert best <= BUDGET, f"import gqlcli.main takes {best:.1f}ms, the budget is {BUDGET}ms"
+
+
+def test_entry_point_defers_heavy_modules():
+    imported = import_times().keys()
+
+    assert [module for module in DEFERRED_MODULES if module in imported] == []
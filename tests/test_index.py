@@ -0,0 +1,119 @@
+import pytest
+from graphql import print_type
+
+from gqlcli.codegen import render_type
+from gqlcli.generator import ResolverGenerator, TypeGenerator
+from gqlcli.index import SchemaIndex, scan_definitions
+from gqlcli.make_schema import make_schema_from_path, schema_files
+
+NODES = '''
+"""
+Has { braces } and ( parens ) and "quotes" in a block string.
+"""
+interface Node {
+  "The id, } not a closing brace"
+  id: ID!
+}
+
+# A comment with } and { and type Fake { x: Int } in it.
+interface Named { name: String }
+
+type User implements Node & Named @key(fields: "id { profile }") {
+  id: ID!
+  """Block } string ( of a field"""
+  name: String @deprecated(reason: "use ) fullName } instead")
+  posts(filter: PostFilter = {title: "{"}, status: Status = DRAFT): [Post!]!
+}
+
+directive @key(fields: String!) repeatable on OBJECT
+'''
+
+POSTS = '''
+extend type Query { users: [User] }
+
+type Post implements Node { id: ID!, title: String, status: Status }
+
+input PostFilter { title: String = "} {", status: Status }
+
+enum Status {
+  "draft, } brace"
+  DRAFT
+  PUBLISHED @deprecated(reason: "(")
+}
+
+union SearchResult = User | Post
+
+extend type User implements Searchable @key(fields: "name") {
+  email: String
+}
+
+interface Searchable { text: String }
+'''
+
+TYPES = ["User", "Post", "Node", "Named", "PostFilter", "Status", "SearchResult", "Searchable", "Query"]
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    (tmp_path / "nodes.graphql").write_text(NODES)
+    (tmp_path / "posts.graphql").write_text(POSTS)
+    return tmp_path
+
+
+@pytest.fixture
+def index(schema_dir):
+    return SchemaIndex.from_files(schema_files(schema_dir))
+
+
+@pytest.fixture
+def schema(schema_dir):
+    return make_schema_from_path(str(schema_dir))
+
+
+def test_scan_finds_top_level_definitions_only():
+    definitions = [(d.kind, d.name, d.extension, d.interfaces) for d in scan_definitions(NODES + POSTS)]
+
+    assert definitions == [
+        ("interface", "Node", False, ()),
+        ("interface", "Named", False, ()),
+        ("type", "User", False, ("Node", "Named")),
+        ("type", "Query", True, ()),
+        ("type", "Post", False, ("Node",)),
+        ("input", "PostFilter", False, ()),
+        ("enum", "Status", False, ()),
+        ("union", "SearchResult", False, ()),
+        ("type", "User", True, ("Searchable",)),
+        ("interface", "Searchable", False, ()),
+    ]
+
+
+def test_definitions_keep_their_description(index):
+    assert index.sdl("Node").startswith('"""\nHas { braces }')
+
+
+@pytest.mark.parametrize("name", TYPES)
+def test_index_schema_prints_like_full_schema(index, schema, name):
+    assert print_type(index.build_schema([name]).type_map[name]) == print_type(schema.type_map[name])
+
+
+@pytest.mark.parametrize("name", TYPES)
+def test_index_schema_generates_like_full_schema(index, schema, name):
+    generator = TypeGenerator("dataclass")
+    built = index.build_schema([name]).type_map[name]
+
+    assert render_type(generator, built, "str") == render_type(generator, schema.type_map[name], "str")
+
+
+@pytest.mark.parametrize("name", ["User", "Post", "Query"])
+def test_index_schema_generates_same_resolvers(index, schema, name):
+    generator = ResolverGenerator(batched=True)
+    built = index.build_schema([name]).type_map[name]
+
+    assert generator.all_field_resolvers(built) == generator.all_field_resolvers(schema.type_map[name])
+
+
+def test_implementations_are_stubbed(index):
+    schema = index.build_schema(["Node"], implementations=True)
+
+    assert [t.name for t in schema.get_possible_types(schema.type_map["Node"])] == ["User", "Post"]
+    assert [i.name for i in schema.type_map["User"].interfaces] == ["Node", "Named", "Searchable"]
@@ -0,0 +1,102 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from graphql import build_schema, introspection_from_schema
+
+from gqlcli.cache import SchemaCache
+from gqlcli.introspection import build_client_schema_with_host
+
+SDL = "type Query { hello: String }"
+
+
+class StubServer(HTTPServer):
+    """GraphQL host answering introspection with `etag`, or 304 to `If-None-Match` on it."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.body = json.dumps({"data": introspection_from_schema(build_schema(SDL))}).encode()
+        self.etag = '"v1"'
+        self.always_304 = False
+        self.requests = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/graphql"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        etag = self.headers.get("If-None-Match")
+        server.requests.append(etag)
+        if server.always_304 or (etag and etag == server.etag):
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SchemaCache(str(tmp_path))
+
+
+def test_fresh_entry_is_used_without_request(server, cache):
+    build_client_schema_with_host(server.url, cache, ttl=300)
+    schema = build_client_schema_with_host(server.url, cache, ttl=300)
+
+    assert "hello" in schema.query_type.fields
+    assert server.requests == [None]
+
+
+def test_expired_entry_is_revalidated_with_etag(server, cache):
+    build_client_schema_with_host(server.url, cache, ttl=0)
+    schema = build_client_schema_with_host(server.url, cache, ttl=0)
+
+    assert "hello" in schema.query_type.fields
+    assert server.requests == [None, '"v1"']
+
+
+def test_refresh_revalidates_fresh_entry(server, cache):
+    build_client_schema_with_host(server.url, cache, ttl=300)
+    build_client_schema_with_host(server.url, cache, ttl=300, refresh=True)
+
+    assert server.requests == [None, '"v1"']
+
+
+def test_changed_schema_replaces_entry(server, cache):
+    build_client_schema_with_host(server.url, cache, ttl=0)
+    server.etag = '"v2"'
+    server.body = json.dumps({"data": introspection_from_schema(build_schema("type Query { bye: Int }"))}).encode()
+    schema = build_client_schema_with_host(server.url, cache, ttl=0)
+
+    assert "bye" in schema.query_type.fields
+    assert build_client_schema_with_host(server.url, cache, ttl=300).query_type.fields.keys() == {"bye"}
+
+
+def test_304_without_cached_entry_is_an_error(server):
+    server.always_304 = True
+
+    with pytest.raises(RuntimeError, match="304"):
+        build_client_schema_with_host(server.url)
@@ -0,0 +1,56 @@
+import importlib
+import sys
+
+import pytest
+
+from gqlcli.make_schema import make_schema_from_path
+from gqlcli.output import ModuleWriter
+
+USERS = """
+extend type Query { user: User }
+type User { id: ID
+  name: String
+  posts: [Post] }
+"""
+POSTS = "type Post { id: ID\n  author: User }\n"
+
+
+@pytest.fixture
+def schema(tmp_path):
+    sdl = tmp_path / "schema"
+    sdl.mkdir()
+    (sdl / "users.graphql").write_text(USERS)
+    (sdl / "posts.graphql").write_text(POSTS)
+    return make_schema_from_path(str(sdl)), sdl
+
+
+def import_package(directory, name):
+    sys.path.insert(0, str(directory))
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(str(directory))
+        for module in [m for m in sys.modules if m == name or m.startswith(f"{name}.")]:
+            del sys.modules[module]
+
+
+@pytest.mark.parametrize("split", ["type", "file"])
+def test_split_pydantic_models_resolve_other_modules(tmp_path, schema, split):
+    pytest.importorskip("pydantic")
+    schema, root = schema
+    name = f"models_{split}"
+    ModuleWriter(tmp_path / name, "pydantic", split, root=root).write(schema.type_map)
+
+    models = import_package(tmp_path, name)
+    user = models.User(id=1, name="a", posts=[models.Post(id=2, author=None)])
+
+    assert user.posts[0].id == 2
+
+
+def test_split_dataclasses_dont_rebuild(tmp_path, schema):
+    schema, root = schema
+    ModuleWriter(tmp_path / "dataclasses_type", "dataclass", "type", root=root).write(schema.type_map)
+
+    assert "model_rebuild" not in (tmp_path / "dataclasses_type" / "__init__.py").read_text()
+    models = import_package(tmp_path, "dataclasses_type")
+    assert models.User(id=1, name="a", posts=[]).name == "a"
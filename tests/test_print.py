@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+from graphql import FragmentDefinitionNode, Visitor, build_schema, parse, validate, visit
+
+from gqlcli.cost import CostEstimator
+from gqlcli.print import FragmentQueryPrinter, root_types
+from gqlcli.synth import synth_schema
+
+# Same named fields of different types across the possible types of a union.
+CONFLICTS = """
+type Query { search(text: String!): [Result] node: Node }
+union Result = Photo | Video
+interface Node { id: ID! }
+type Photo implements Node { id: ID! size: Int url: String owner: Node }
+type Video implements Node { id: ID! size: Float url: String! clips(first: Int!): [Video] }
+"""
+
+SCHEMAS = {
+    "starwars": (Path(__file__).parents[1] / "schema.graphql").read_text(),
+    "synth": synth_schema(40, 8, seed=0),
+    "conflicts": CONFLICTS,
+}
+
+BUDGETS = [(None, None), (1, None), (2, None), (3, None), (None, 1), (None, 5), (None, 20), (2, 10)]
+
+
+def fragment_fields(document) -> int:
+    """Fields selected by the fragments of `document`, but `__typename`."""
+    fields = []
+
+    class FieldCounter(Visitor):
+        def enter_field(self, node, *_args):
+            if node.name.value != "__typename":
+                fields.append(node)
+
+    for definition in document.definitions:
+        if isinstance(definition, FragmentDefinitionNode):
+            visit(definition, FieldCounter())
+    return len(fields)
+
+
+@pytest.mark.parametrize("name", SCHEMAS)
+@pytest.mark.parametrize("max_depth, max_fields", BUDGETS)
+def test_fragment_queries_are_valid_within_budgets(name, max_depth, max_fields):
+    schema = build_schema(SCHEMAS[name])
+    printer = FragmentQueryPrinter(schema, max_depth, max_fields)
+    estimator = CostEstimator(schema)
+
+    for op_type, root in root_types(schema):
+        for op, field in root.fields.items():
+            query = printer.print_operation(field, op, op_type)
+            document = parse(query)
+
+            assert validate(schema, document) == [], query
+            if max_depth:
+                # The root field is not nested.
+                assert estimator.estimate(document)[op].depth <= max_depth + 1, query
+            if max_fields:
+                assert fragment_fields(document) <= max_fields, query
+
+
+def test_conflicting_fields_are_aliased():
+    query = FragmentQueryPrinter(build_schema(CONFLICTS)).print_query("search")
+
+    assert "sizePhoto: size" in query
+    assert "sizeVideo: size" in query
+    assert "urlVideo: url" in query
+    # Fields with required arguments are left out.
+    assert "clips" not in query
+
+
+def test_unknown_root_field():
+    assert FragmentQueryPrinter(build_schema(SCHEMAS["starwars"])).print_query("nope") == "No nope query."
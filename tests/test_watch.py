@@ -0,0 +1,48 @@
+import gqlcli.watch
+from gqlcli.watch import SchemaWatcher
+
+SDL = "type Query { hello: String }\n"
+
+
+def test_file_removed_while_polled_is_parsed_on_next_poll(tmp_path, monkeypatch):
+    schema = tmp_path / "schema.graphql"
+    schema.write_text(SDL)
+    saved = tmp_path / "users.graphql"
+    watcher = SchemaWatcher(tmp_path)
+    assert watcher.poll()
+
+    # Listed, then renamed away by an atomic save before it is read.
+    monkeypatch.setattr(gqlcli.watch, "schema_files", lambda path: [schema, saved])
+    assert not watcher.poll()
+    assert list(watcher.documents) == [schema]
+
+    saved.write_text("type User { id: ID }\nextend type Query { user: User }\n")
+    assert watcher.poll()
+    assert "User" in watcher.build().type_map
+
+
+def test_file_removed_while_parsed_is_left_out(tmp_path, monkeypatch):
+    (tmp_path / "schema.graphql").write_text(SDL)
+    watcher = SchemaWatcher(tmp_path)
+
+    def parse_from_file(file):
+        raise FileNotFoundError(file)
+
+    monkeypatch.setattr(gqlcli.watch, "parse_from_file", parse_from_file)
+    assert not watcher.poll()
+    assert watcher.documents == {}
+
+
+def test_replaced_schema_file_keeps_the_schema(tmp_path):
+    schema = tmp_path / "schema.graphql"
+    schema.write_text(SDL)
+    watcher = SchemaWatcher(schema)
+    assert watcher.poll()
+
+    schema.unlink()
+    assert not watcher.poll()
+    assert "hello" in watcher.build().query_type.fields
+
+    schema.write_text("type Query { bye: String }\n")
+    assert watcher.poll()
+    assert "bye" in watcher.build().query_type.fields